@@ -0,0 +1,279 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+import project_17 as game
+
+SUB_STEPS = (
+    'update_enemy_movement',
+    'update_helper_aircraft',
+    'update_life_gifts',
+    'update_player_bullets',
+    'update_enemy_bullets',
+    'fire_enemy_bullets',
+    'update_enemy_hits',
+    'update_bullet_interception',
+    'update_asteroids',
+    'update_asteroid_trails',
+    'update_asteroid_player_collisions',
+    'update_enemy_player_collision',
+    'update_explosions',
+)
+
+SCENARIOS = {
+    'baseline': dict(asteroids=10, player_bullets=0, enemy_bullets=0, explosions=0, enemies=1),
+    'asteroid_field': dict(asteroids=300, player_bullets=50, enemy_bullets=50, explosions=10, enemies=1),
+    'bullet_storm': dict(asteroids=30, player_bullets=500, enemy_bullets=500, explosions=20, enemies=4),
+    'explosions': dict(asteroids=30, player_bullets=50, enemy_bullets=50, explosions=120, enemies=1),
+    'ufo_swarm': dict(asteroids=30, player_bullets=100, enemy_bullets=300, explosions=20, enemies=50),
+    'ufo_swarm_shield': dict(asteroids=30, player_bullets=100, enemy_bullets=300, explosions=20, enemies=50,
+                             cheat_mode=True),
+}
+
+
+POPULATIONS = ('asteroids', 'player_bullets', 'enemy_bullets', 'explosions', 'enemies')
+
+
+class Population:
+    """Keeps each entity store of a scenario at its target size between ticks."""
+
+    def __init__(self, seed=0, **targets):
+        self.rng = np.random.default_rng(seed)
+        self.targets = targets
+        self.extent = game.GRID_LENGTH * 0.9
+
+    def fill(self, state):
+        for name, target in self.targets.items():
+            store = getattr(state, name)
+            missing = target - len(store)
+            if missing > 0:
+                getattr(self, 'add_' + name)(state, missing)
+            elif missing < 0:
+                for row in np.flatnonzero(store.alive[:store.count])[target:]:
+                    if name == 'asteroids':
+                        state.remove_asteroid(row)
+                    else:
+                        store.kill(row)
+            store.flush()
+
+    def check(self, state):
+        return {name: (len(getattr(state, name)), target) for name, target in self.targets.items()
+                if len(getattr(state, name)) != target}
+
+    def add_asteroids(self, state, count):
+        rng = self.rng
+        positions = state.generate_random_positions(count)
+        velocities = rng.uniform(-3.0, 3.0, (count, 3))
+        velocities[:, 2] = 0
+        for pos, velocity, size, kind in zip(positions, velocities, rng.uniform(8, 18, count),
+                                             rng.integers(0, 3, count)):
+            state.add_asteroid(pos, size, int(kind), velocity, 0.8)
+
+    def add_player_bullets(self, state, count):
+        rng = self.rng
+        extent = self.extent
+        for _ in range(count):
+            angle = rng.uniform(0, 2 * np.pi)
+            state.player_bullets.add(
+                pos=[rng.uniform(-extent, extent), rng.uniform(-extent, extent), 50],
+                velocity=[np.cos(angle) * game.PLAYER_BULLET_SPEED, np.sin(angle) * game.PLAYER_BULLET_SPEED, 0]
+            )
+
+    def add_enemy_bullets(self, state, count):
+        rng = self.rng
+        extent = self.extent
+        for _ in range(count):
+            direction = rng.normal(size=3)
+            direction /= np.linalg.norm(direction)
+            state.enemy_bullets.add(
+                pos=[rng.uniform(-extent, extent), rng.uniform(-extent, extent), rng.uniform(30, 80)],
+                direction=direction, style=int(rng.integers(0, 5)), color=[1.0, 0.0, 0.0]
+            )
+
+    def add_explosions(self, state, count):
+        rng = self.rng
+        extent = self.extent
+        for _ in range(count):
+            state.add_explosion([rng.uniform(-extent, extent), rng.uniform(-extent, extent), 50],
+                                rng.uniform(10, 40), rng.uniform(0.5, 3.0))
+
+    def add_enemies(self, state, count):
+        state.spawn_enemies(count)
+
+
+def build_scenario(asteroids=10, player_bullets=0, enemy_bullets=0, explosions=0, enemies=1,
+                   cheat_mode=False, helper=True, seed=0):
+    state = game.GameState(random.Random(seed), enemy_count=enemies)
+    state.cheat_mode = cheat_mode
+    state.helper_active = helper
+    population = Population(seed, asteroids=asteroids, player_bullets=player_bullets,
+                            enemy_bullets=enemy_bullets, explosions=explosions, enemies=enemies)
+    population.fill(state)
+    return state, population
+
+
+class StepTimer:
+    def __init__(self, names):
+        self.names = names
+        self.originals = {}
+        self.totals = dict.fromkeys(names, 0)
+        self.calls = dict.fromkeys(names, 0)
+
+    def _wrap(self, name, func):
+        totals = self.totals
+        calls = self.calls
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[name] += clock() - start
+                calls[name] += 1
+        return timed
+
+    def install(self):
+        for name in self.names:
+            func = getattr(game, name)
+            self.originals[name] = func
+            setattr(game, name, self._wrap(name, func))
+
+    def uninstall(self):
+        for name, func in self.originals.items():
+            setattr(game, name, func)
+        self.originals.clear()
+
+    def reset(self):
+        for name in self.names:
+            self.totals[name] = 0
+            self.calls[name] = 0
+
+
+def run_scenario(name, params, ticks=500, warmup=50, seed=0):
+    state, population = build_scenario(seed=seed, **params)
+    game.game_state = state
+    timer = StepTimer(SUB_STEPS)
+    timer.install()
+    frame_times = np.empty(ticks, dtype=np.int64)
+    try:
+        for tick in range(warmup + ticks):
+            if tick == warmup:
+                timer.reset()
+            state.player_lives = max(state.player_lives, 1)
+            state.player_missed_bullets = 0
+            state.game_over = False
+            # Entities die as the simulation runs; top the stores back up so every
+            # tick is measured at the load the scenario is named for.
+            population.fill(state)
+            mismatched = population.check(state)
+            if mismatched:
+                raise RuntimeError(f"{name}: tick {tick} starts with {mismatched} (count, target) entities")
+            start = time.perf_counter_ns()
+            game.update_game_state()
+            if tick >= warmup:
+                frame_times[tick - warmup] = time.perf_counter_ns() - start
+    finally:
+        timer.uninstall()
+
+    frame_us = frame_times / 1000.0
+    steps = {}
+    for step in SUB_STEPS:
+        calls = timer.calls[step]
+        total = timer.totals[step] / 1000.0
+        steps[step] = {
+            'calls': calls,
+            'total_us': round(total, 1),
+            'mean_us': round(total / calls, 2) if calls else 0.0,
+        }
+    return {
+        'scenario': name,
+        'params': dict(params, seed=seed),
+        'ticks': ticks,
+        'update_game_state': {
+            'mean_us': round(float(frame_us.mean()), 2),
+            'p50_us': round(float(np.percentile(frame_us, 50)), 2),
+            'p95_us': round(float(np.percentile(frame_us, 95)), 2),
+            'p99_us': round(float(np.percentile(frame_us, 99)), 2),
+            'max_us': round(float(frame_us.max()), 2),
+        },
+        'steps': steps,
+        'population': dict(population.targets),
+        'final_counts': {
+            'asteroids': len(state.asteroids),
+            'player_bullets': len(state.player_bullets),
+            'enemy_bullets': len(state.enemy_bullets),
+            'explosions': len(state.explosions),
+            'enemies': len(state.enemies),
+            'trail_particles': len(state.trails),
+        },
+    }
+
+
+def print_result(result, out=sys.stdout):
+    frame = result['update_game_state']
+    out.write(f"{result['scenario']}: mean {frame['mean_us']:.0f}us  p95 {frame['p95_us']:.0f}us  "
+              f"max {frame['max_us']:.0f}us\n")
+    for step, timing in result['steps'].items():
+        if timing['calls']:
+            out.write(f"  {step:<36} {timing['mean_us']:>9.1f}us x{timing['calls']}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation step on generated stress scenarios.")
+    parser.add_argument('scenarios', nargs='*', help=f"preset scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--ticks', type=int, default=500, help="measured ticks per scenario")
+    parser.add_argument('--warmup', type=int, default=50, help="unmeasured ticks before timing starts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--asteroids', type=int, help="custom scenario: asteroid count (default 10)")
+    parser.add_argument('--player-bullets', type=int, help="custom scenario: player bullet count (default 0)")
+    parser.add_argument('--enemy-bullets', type=int, help="custom scenario: enemy bullet count (default 0)")
+    parser.add_argument('--explosions', type=int, help="custom scenario: explosion count (default 0)")
+    parser.add_argument('--enemies', type=int, help="custom scenario: enemy UFO count (default 1)")
+    parser.add_argument('--cheat', action='store_true', help="custom scenario: shield on")
+    parser.add_argument('--json', metavar='PATH', help="write results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    custom = {
+        'asteroids': args.asteroids,
+        'player_bullets': args.player_bullets,
+        'enemy_bullets': args.enemy_bullets,
+        'explosions': args.explosions,
+        'enemies': args.enemies,
+    }
+    if args.cheat or any(value is not None for value in custom.values()):
+        if args.scenarios:
+            parser.error("preset scenarios cannot be combined with custom scenario options")
+        defaults = {'asteroids': 10, 'player_bullets': 0, 'enemy_bullets': 0, 'explosions': 0, 'enemies': 1}
+        params = {name: defaults[name] if value is None else value for name, value in custom.items()}
+        selected = {'custom': dict(params, cheat_mode=args.cheat)}
+    else:
+        unknown = [name for name in args.scenarios if name not in SCENARIOS]
+        if unknown:
+            parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+        selected = {name: SCENARIOS[name] for name in (args.scenarios or SCENARIOS)}
+
+    results = []
+    report = sys.stderr if args.json == '-' else sys.stdout
+    for name, params in selected.items():
+        result = run_scenario(name, params, ticks=args.ticks, warmup=args.warmup, seed=args.seed)
+        results.append(result)
+        print_result(result, report)
+
+    if args.json:
+        document = {'python': sys.version.split()[0], 'numpy': np.__version__, 'results': results}
+        if args.json == '-':
+            json.dump(document, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            with open(args.json, 'w') as f:
+                json.dump(document, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+
+# Below this many points a plain loop beats the fixed cost of the numpy calls.
+SCALAR_LIMIT = 16
+
+
+def swept_sphere_contacts(start, delta, center, radius):
+    # Moving points start + t * delta (t in [0, 1]) against a sphere. Returns the
+    # hit mask, and for the hits the entry parameter and contact point.
+    if len(start) <= SCALAR_LIMIT:
+        return _scalar_contacts(start, delta, center, radius)
+    start = np.asarray(start, dtype=np.float32)
+    delta = np.asarray(delta, dtype=np.float32)
+    center = np.asarray(center, dtype=np.float32)
+
+    to_start = start - center
+    a = np.einsum('ij,ij->i', delta, delta)
+    b = np.einsum('ij,ij->i', to_start, delta)
+    c = np.einsum('ij,ij->i', to_start, to_start) - radius * radius
+
+    moving = a > 0
+    safe_a = np.where(moving, a, 1.0)
+    closest_t = np.clip(np.where(moving, -b / safe_a, 0.0), 0.0, 1.0)
+    closest = to_start + closest_t[:, None] * delta
+    hits = np.einsum('ij,ij->i', closest, closest) < radius * radius
+
+    h = np.flatnonzero(hits)
+    disc = np.maximum(b[h] * b[h] - a[h] * c[h], 0.0)
+    enter_t = np.where(c[h] < 0, 0.0, (-b[h] - np.sqrt(disc)) / safe_a[h])
+    enter_t = np.clip(enter_t, 0.0, 1.0)
+    contacts = start[h] + enter_t[:, None] * delta[h]
+    return hits, enter_t, contacts
+
+
+def _scalar_contacts(start, delta, center, radius):
+    cx, cy, cz = (float(v) for v in center)
+    radius_sq = radius * radius
+    hits = []
+    enter_t = []
+    contacts = []
+    for (sx, sy, sz), (dx, dy, dz) in zip(np.asarray(start).tolist(), np.asarray(delta).tolist()):
+        ox, oy, oz = sx - cx, sy - cy, sz - cz
+        a = dx * dx + dy * dy + dz * dz
+        b = ox * dx + oy * dy + oz * dz
+        c = ox * ox + oy * oy + oz * oz - radius_sq
+        t = min(max(-b / a, 0.0), 1.0) if a > 0 else 0.0
+        px, py, pz = ox + t * dx, oy + t * dy, oz + t * dz
+        hit = px * px + py * py + pz * pz < radius_sq
+        hits.append(hit)
+        if hit:
+            # A hit with a == 0 starts inside the sphere, so c < 0 there.
+            t = 0.0 if c < 0 else min(max((-b - math.sqrt(max(b * b - a * c, 0.0))) / a, 0.0), 1.0)
+            enter_t.append(t)
+            contacts.append((sx + t * dx, sy + t * dy, sz + t * dz))
+    return (np.array(hits, dtype=bool), np.array(enter_t, dtype=np.float32),
+            np.array(contacts, dtype=np.float32).reshape(-1, 3))
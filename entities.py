@@ -0,0 +1,155 @@
+class EntityView:
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    @property
+    def handle(self):
+        return self.store.handle_of(self.row)
+
+    @property
+    def alive(self):
+        return bool(self.store.alive[self.row])
+
+    @property
+    def pos(self):
+        return self.store.pos[self.row]
+
+    @pos.setter
+    def pos(self, value):
+        self.store.pos[self.row] = value
+
+    @property
+    def velocity(self):
+        return self.store.velocity[self.row]
+
+    @property
+    def size(self):
+        return float(self.store.size[self.row])
+
+    @size.setter
+    def size(self, value):
+        self.store.size[self.row] = value
+
+    def kill(self):
+        self.store.kill(self.row)
+
+
+class Asteroid(EntityView):
+    __slots__ = ()
+
+    @property
+    def rotation(self):
+        return self.store.rotation[self.row]
+
+    @property
+    def type(self):
+        return int(self.store.type[self.row])
+
+    @property
+    def heat_level(self):
+        return float(self.store.heat_level[self.row])
+
+    @property
+    def emitter(self):
+        return int(self.store.emitter[self.row])
+
+
+class Bullet(EntityView):
+    __slots__ = ()
+
+    @property
+    def is_helper(self):
+        return bool(self.store.is_helper[self.row])
+
+
+class EnemyBullet(EntityView):
+    __slots__ = ()
+
+    @property
+    def direction(self):
+        return self.store.direction[self.row]
+
+    @property
+    def style(self):
+        return int(self.store.style[self.row])
+
+    @property
+    def color(self):
+        return self.store.color[self.row]
+
+
+class Enemy(EntityView):
+    __slots__ = ()
+
+    @property
+    def target(self):
+        return self.store.target[self.row]
+
+    @property
+    def lives(self):
+        return int(self.store.lives[self.row])
+
+    @property
+    def max_lives(self):
+        return int(self.store.max_lives[self.row])
+
+    @property
+    def evolution(self):
+        return int(self.store.evolution[self.row])
+
+    @property
+    def color(self):
+        return self.store.color[self.row]
+
+    @property
+    def visible(self):
+        return bool(self.store.visible[self.row])
+
+
+class Explosion(EntityView):
+    __slots__ = ()
+
+    @property
+    def age(self):
+        return float(self.store.age[self.row])
+
+    @property
+    def duration(self):
+        return float(self.store.duration[self.row])
+
+
+class LifeGift(EntityView):
+    __slots__ = ()
+
+    @property
+    def age(self):
+        return float(self.store.age[self.row])
+
+
+class Star:
+    __slots__ = ('x', 'y', 'z', 'brightness', 'blink_rate')
+
+    def __init__(self, x, y, z, brightness, blink_rate):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.brightness = brightness
+        self.blink_rate = blink_rate
+
+
+class Planet:
+    __slots__ = ('x', 'y', 'z', 'size', 'color', 'rings', 'ring_color', 'rotation', 'rotation_speed')
+
+    def __init__(self, x, y, z, size, color, rings, ring_color, rotation, rotation_speed):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.size = size
+        self.color = color
+        self.rings = rings
+        self.ring_color = ring_color
+        self.rotation = rotation
+        self.rotation_speed = rotation_speed
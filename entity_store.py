@@ -0,0 +1,240 @@
+import numpy as np
+
+BASE_FIELDS = {
+    'pos': ((3,), np.float32),
+    'prev_pos': ((3,), np.float32),
+    'velocity': ((3,), np.float32),
+    'rotation': ((3,), np.float32),
+    'rotation_speed': ((3,), np.float32),
+    'size': ((), np.float32),
+}
+
+NO_ROW = -1
+OVERFLOW_POLICIES = ('grow', 'drop', 'recycle')
+HANDLE_SLOT_BITS = 32
+HANDLE_SLOT_MASK = (1 << HANDLE_SLOT_BITS) - 1
+
+
+class EntityStore:
+    def __init__(self, capacity=64, fields=None, overflow='grow', entity_type=None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.capacity = max(1, capacity)
+        self.overflow = overflow
+        self.count = 0
+        self.serial = np.zeros(self.capacity, dtype=np.int64)
+        self.next_serial = 0
+        self.dropped = 0
+        self.recycled = 0
+        self.fields = dict(BASE_FIELDS)
+        if fields:
+            self.fields.update(fields)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.handle = np.zeros(self.capacity, dtype=np.int64)
+        for name, (shape, dtype) in self.fields.items():
+            setattr(self, name, np.zeros((self.capacity,) + shape, dtype=dtype))
+
+        self.handle_row = np.full(self.capacity, NO_ROW, dtype=np.int64)
+        self.handle_generation = np.zeros(self.capacity, dtype=np.int64)
+        self.free_handles = list(range(self.capacity - 1, -1, -1))
+        self.pending = []
+
+        self.entity_type = entity_type
+        self._entities = [entity_type(self, row) for row in range(self.capacity)] if entity_type else []
+
+    def __len__(self):
+        return self.count - len(self.pending)
+
+    def __iter__(self):
+        alive = self.alive
+        for row in range(self.count):
+            if alive[row]:
+                yield row
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        internal = [('alive', ((), bool)), ('handle', ((), np.int64)), ('serial', ((), np.int64))]
+        for name, (shape, dtype) in internal + list(self.fields.items()):
+            column = np.zeros((new_capacity,) + shape, dtype=dtype)
+            column[:old_capacity] = getattr(self, name)
+            setattr(self, name, column)
+
+        handle_row = np.full(new_capacity, NO_ROW, dtype=np.int64)
+        handle_row[:old_capacity] = self.handle_row
+        self.handle_row = handle_row
+        generation = np.zeros(new_capacity, dtype=np.int64)
+        generation[:old_capacity] = self.handle_generation
+        self.handle_generation = generation
+        self.free_handles[:0] = range(new_capacity - 1, old_capacity - 1, -1)
+        if self.entity_type:
+            self._entities.extend(self.entity_type(self, row) for row in range(old_capacity, new_capacity))
+        self.capacity = new_capacity
+
+    def _oldest_live_row(self):
+        serial = np.where(self.alive[:self.count], self.serial[:self.count], np.iinfo(np.int64).max)
+        row = int(np.argmin(serial))
+        return row if self.alive[row] else NO_ROW
+
+    def add(self, **values):
+        recycling = False
+        if self.count == self.capacity:
+            if self.overflow == 'grow':
+                self._grow()
+            elif self.overflow == 'recycle' and self.pending:
+                row = self.pending.pop()
+                self._release_handle(row)
+                recycling = True
+            else:
+                row = self._oldest_live_row() if self.overflow == 'recycle' else NO_ROW
+                if row == NO_ROW:
+                    self.dropped += 1
+                    return NO_ROW
+                self._release_handle(row)
+                self.recycled += 1
+                recycling = True
+        if not recycling:
+            row = self.count
+            self.count += 1
+
+        for name, (shape, dtype) in self.fields.items():
+            column = getattr(self, name)
+            if name in values:
+                column[row] = values[name]
+            elif dtype is object:
+                column[row] = None
+            else:
+                column[row] = 0
+        if 'prev_pos' not in values:
+            self.prev_pos[row] = self.pos[row]
+
+        slot = self.free_handles.pop()
+        self.handle_row[slot] = row
+        self.handle[row] = (int(self.handle_generation[slot]) << HANDLE_SLOT_BITS) | slot
+        self.serial[row] = self.next_serial
+        self.next_serial += 1
+        self.alive[row] = True
+        return row
+
+    def entity(self, row):
+        return self._entities[row]
+
+    def entities(self):
+        entities = self._entities
+        alive = self.alive
+        for row in range(self.count):
+            if alive[row]:
+                yield entities[row]
+
+    def handle_of(self, row):
+        return int(self.handle[row])
+
+    def row_of(self, handle):
+        slot = handle & HANDLE_SLOT_MASK
+        if slot >= self.capacity or int(self.handle_generation[slot]) != handle >> HANDLE_SLOT_BITS:
+            return NO_ROW
+        row = int(self.handle_row[slot])
+        if row == NO_ROW or not self.alive[row]:
+            return NO_ROW
+        return row
+
+    def rows_of(self, handles):
+        handles = np.asarray(handles, dtype=np.int64)
+        slots = handles & HANDLE_SLOT_MASK
+        in_range = slots < self.capacity
+        slots = np.where(in_range, slots, 0)
+        rows = np.where(in_range & (self.handle_generation[slots] == handles >> HANDLE_SLOT_BITS),
+                        self.handle_row[slots], NO_ROW)
+        live = rows != NO_ROW
+        live[live] = self.alive[rows[live]]
+        return np.where(live, rows, NO_ROW)
+
+    def kill(self, row):
+        if self.alive[row]:
+            self.alive[row] = False
+            self.pending.append(row)
+
+    def kill_mask(self, mask):
+        rows = np.flatnonzero(mask & self.alive[:len(mask)])
+        if len(rows):
+            self.alive[rows] = False
+            self.pending.extend(rows.tolist())
+
+    def _release_handle(self, row):
+        slot = int(self.handle[row]) & HANDLE_SLOT_MASK
+        self.handle_row[slot] = NO_ROW
+        self.handle_generation[slot] += 1
+        self.free_handles.append(slot)
+
+    def flush(self):
+        if not self.pending:
+            return
+        for row in sorted(self.pending, reverse=True):
+            self._release_handle(row)
+            last = self.count - 1
+            if row != last:
+                for name in self.fields:
+                    column = getattr(self, name)
+                    column[row] = column[last]
+                self.handle[row] = self.handle[last]
+                self.serial[row] = self.serial[last]
+                self.alive[row] = True
+                self.handle_row[int(self.handle[row]) & HANDLE_SLOT_MASK] = row
+            for name, (shape, dtype) in self.fields.items():
+                if dtype is object:
+                    getattr(self, name)[last] = None
+            self.alive[last] = False
+            self.count = last
+        self.pending.clear()
+
+    def clear(self):
+        for row in range(self.count):
+            self._release_handle(row)
+        for name, (shape, dtype) in self.fields.items():
+            if dtype is object:
+                getattr(self, name)[:self.count] = None
+        self.alive[:self.count] = False
+        self.pending.clear()
+        self.count = 0
+
+    def restore(self, count, columns, handle, serial, next_serial, handle_generation):
+        self.clear()
+        while self.capacity < max(count, len(handle_generation)):
+            self._grow()
+        for name, values in columns.items():
+            getattr(self, name)[:count] = values
+        self.handle[:count] = handle
+        self.serial[:count] = serial
+        self.next_serial = next_serial
+        self.alive[:count] = True
+        self.count = count
+
+        self.handle_generation[:len(handle_generation)] = handle_generation
+        self.handle_row[:] = NO_ROW
+        slots = handle & HANDLE_SLOT_MASK
+        self.handle_row[slots] = np.arange(count)
+        free = np.ones(self.capacity, dtype=bool)
+        free[slots] = False
+        self.free_handles = np.flatnonzero(free)[::-1].tolist()
+
+    def save_positions(self):
+        self.prev_pos[:self.count] = self.pos[:self.count]
+
+    def interpolated_positions(self, alpha):
+        n = self.count
+        if alpha >= 1.0:
+            return self.pos[:n]
+        return self.prev_pos[:n] + (self.pos[:n] - self.prev_pos[:n]) * np.float32(alpha)
+
+    def integrate(self, scale=1.0):
+        n = self.count
+        if scale == 1.0:
+            self.pos[:n] += self.velocity[:n]
+        else:
+            self.pos[:n] += self.velocity[:n] * scale
+
+    def spin(self):
+        n = self.count
+        rotation = self.rotation[:n]
+        rotation += self.rotation_speed[:n]
+        np.mod(rotation, 360.0, out=rotation)
@@ -0,0 +1,178 @@
+import argparse
+import random
+import sys
+import time
+
+import project_17 as game
+from replay import InputRecorder, load_replay, replay_seed, state_digest
+from snapshot import load_snapshot, save_snapshot
+from tracer import Tracer
+
+
+def load_script(path):
+    script = {}
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) != 3 or parts[1] not in ('key', 'mouse'):
+                raise ValueError(f"{path}:{line_no}: expected '<tick> key <char>' or '<tick> mouse <left|right>'")
+            tick = int(parts[0])
+            if parts[1] == 'key':
+                event = ('key', parts[2].encode()[:1])
+            else:
+                if parts[2] not in ('left', 'right'):
+                    raise ValueError(f"{path}:{line_no}: unknown mouse button '{parts[2]}'")
+                event = ('mouse', parts[2])
+            script.setdefault(tick, []).append(event)
+    return script
+
+
+def dispatch_event(event):
+    kind, value = event
+    if kind == 'key':
+        game.keyboardListener(value, 0, 0)
+    elif kind == 'mouse':
+        button = game.GLUT_LEFT_BUTTON if value == 'left' else game.GLUT_RIGHT_BUTTON
+        game.mouseListener(button, game.GLUT_DOWN, 0, 0)
+
+
+class HeadlessEngine:
+    def __init__(self, script=None, autofire=0, cheat_mode=False, restart_on_game_over=False,
+                 seed=None, recorder=None, stop_on_game_over=True, enemies=1):
+        game.game_state = game.GameState(random.Random(seed), enemy_count=enemies)
+        game.input_recorder = recorder
+        self.script = script or {}
+        self.autofire = autofire
+        self.restart_on_game_over = restart_on_game_over
+        self.stop_on_game_over = stop_on_game_over
+        self.tick = 0
+        self.games_played = 1
+        if cheat_mode:
+            dispatch_event(('key', b'i'))
+
+    @property
+    def state(self):
+        return game.game_state
+
+    def step(self):
+        for event in self.script.get(self.tick, ()):
+            dispatch_event(event)
+        if self.autofire and self.tick % self.autofire == 0:
+            dispatch_event(('mouse', 'left'))
+
+        game.update_game_state()
+        self.tick += 1
+
+        if self.restart_on_game_over and game.game_state.game_over:
+            cheat_mode = game.game_state.cheat_mode
+            dispatch_event(('key', b'r'))
+            if cheat_mode:
+                dispatch_event(('key', b'i'))
+            self.games_played += 1
+
+    def run(self, ticks=None, seconds=None):
+        if ticks is None and seconds is None:
+            raise ValueError("run() needs a tick count or a time limit")
+
+        start_tick = self.tick
+        start = time.perf_counter()
+        deadline = start + seconds if seconds is not None else None
+        while True:
+            if ticks is not None and self.tick - start_tick >= ticks:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if game.game_state.game_over and self.stop_on_game_over and not self.restart_on_game_over:
+                break
+            self.step()
+        elapsed = time.perf_counter() - start
+
+        ran = self.tick - start_tick
+        return {
+            'ticks': ran,
+            'elapsed': elapsed,
+            'ticks_per_second': ran / elapsed if elapsed > 0 else float('inf'),
+            'games_played': self.games_played,
+            'game_over': game.game_state.game_over,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the space shooter simulation without a window.")
+    parser.add_argument('--ticks', type=int, help="number of simulation ticks to run")
+    parser.add_argument('--seconds', type=float, help="wall-clock time limit")
+    parser.add_argument('--script', help="input script with '<tick> key <char>' / '<tick> mouse <left|right>' lines")
+    parser.add_argument('--autofire', type=int, default=0, metavar='N', help="click the left button every N ticks")
+    parser.add_argument('--cheat', action='store_true', help="start with the shield (cheat mode) enabled")
+    parser.add_argument('--restart', action='store_true', help="restart instead of stopping on game over")
+    parser.add_argument('--enemies', type=int, default=1, help="number of enemy UFOs on the field")
+    parser.add_argument('--seed', type=replay_seed, help="seed for the game's random number generator")
+    parser.add_argument('--record', metavar='PATH', help="record the input events of this run to a replay file")
+    parser.add_argument('--replay', metavar='PATH', help="re-run a recorded replay file and verify the final state")
+    parser.add_argument('--load-snapshot', metavar='PATH', help="start from a saved game snapshot")
+    parser.add_argument('--save-snapshot', metavar='PATH', help="save a game snapshot when the run ends")
+    parser.add_argument('--trace', metavar='PATH', help="write a trace-event JSON file of the simulation steps")
+    args = parser.parse_args(argv)
+    if args.record and args.load_snapshot:
+        parser.error("--record cannot be combined with --load-snapshot: a replay always starts from a new game")
+
+    tracer = None
+    if args.trace:
+        tracer = Tracer()
+        traced = ['update_game_state']
+        traced.extend(name for name in sorted(vars(game)) if name.startswith('update_'))
+        tracer.install(vars(game), traced)
+
+    if args.replay:
+        replay = load_replay(args.replay)
+        engine = HeadlessEngine(replay.script, seed=replay.seed, stop_on_game_over=False, enemies=replay.enemies)
+        result = engine.run(ticks=replay.ticks)
+    else:
+        if args.ticks is None and args.seconds is None:
+            args.ticks = 10000
+        seed = args.seed
+        recorder = None
+        if args.record:
+            if seed is None:
+                seed = random.getrandbits(63)
+            recorder = InputRecorder(args.record, seed, game.SIM_DT, args.enemies)
+        script = load_script(args.script) if args.script else None
+        engine = HeadlessEngine(script, autofire=args.autofire, cheat_mode=args.cheat,
+                                restart_on_game_over=args.restart, seed=seed, recorder=recorder,
+                                enemies=args.enemies)
+        if args.load_snapshot:
+            load_snapshot(args.load_snapshot, engine.state)
+        result = engine.run(ticks=args.ticks, seconds=args.seconds)
+        if recorder is not None:
+            recorder.close(engine.state)
+            print(f"recorded: {args.record} ({recorder.events} events, seed {seed})")
+
+    print(f"ticks: {result['ticks']}")
+    print(f"elapsed: {result['elapsed']:.3f}s")
+    print(f"ticks/second: {result['ticks_per_second']:.1f}")
+    print(f"games played: {result['games_played']}")
+    if result['game_over']:
+        print("stopped: game over")
+    if args.save_snapshot:
+        save_snapshot(args.save_snapshot, engine.state)
+        print(f"snapshot: {args.save_snapshot}")
+    if tracer is not None:
+        tracer.uninstall(vars(game))
+        events = tracer.write(args.trace)
+        print(f"trace: {args.trace} ({events} events, {tracer.dropped} dropped)")
+    if args.replay:
+        if replay.digest is None:
+            print("replay: no final state recorded, not verified")
+        elif state_digest(engine.state) == replay.digest:
+            print("replay: final state matches")
+        else:
+            print("replay: final state DIFFERS from the recording")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+def sphere_line_vertices(lats, longs):
+    lat = np.pi * (-0.5 + np.arange(lats + 1) / lats)
+    lng = 2 * np.pi * np.arange(longs + 1) / longs
+    zr = np.cos(lat)[:, None]
+    grid = np.stack((np.cos(lng)[None, :] * zr,
+                     np.sin(lng)[None, :] * zr,
+                     np.broadcast_to(np.sin(lat)[:, None], zr.shape[:1] + lng.shape)), axis=-1)
+
+    rings = np.stack((grid[:, :-1], grid[:, 1:]), axis=2).reshape(-1, 3)
+    meridians = np.stack((grid[:-1, :], grid[1:, :]), axis=2).reshape(-1, 3)
+    return np.ascontiguousarray(np.concatenate((rings, meridians)), dtype=np.float32)
+
+
+def torus_triangles(inner_radius, outer_radius, sides, rings):
+    ring = 2 * np.pi * np.arange(rings + 1) / rings
+    side = 2 * np.pi * np.arange(sides + 1) / sides
+    cos_ring, sin_ring = np.cos(ring)[:, None], np.sin(ring)[:, None]
+    cos_side, sin_side = np.cos(side)[None, :], np.sin(side)[None, :]
+
+    normals = np.stack(np.broadcast_arrays(cos_side * cos_ring, cos_side * sin_ring, sin_side), axis=-1)
+    spoke = outer_radius + inner_radius * cos_side
+    vertices = np.stack(np.broadcast_arrays(spoke * cos_ring, spoke * sin_ring, inner_radius * sin_side), axis=-1)
+
+    def quads(grid):
+        v1, v2 = grid[:-1, :-1], grid[1:, :-1]
+        v3, v4 = grid[:-1, 1:], grid[1:, 1:]
+        return np.stack((v1, v2, v3, v2, v4, v3), axis=2).reshape(-1, 3)
+
+    return (np.ascontiguousarray(quads(vertices), dtype=np.float32),
+            np.ascontiguousarray(quads(normals), dtype=np.float32))
+
+
+class AuroraMesh:
+    def __init__(self, layers=5, grid_size=50, spacing=10):
+        i = np.arange(-grid_size, grid_size - 2, 2)
+        j = np.arange(-grid_size, grid_size - 4, 4)
+        self.layers = layers
+        self.xs = np.arange(-grid_size, grid_size + 1, 2) * spacing
+        self.ys = np.arange(-grid_size, grid_size + 1, 4) * spacing
+        self.layer_heights = -200.0 + 100.0 * np.arange(layers)
+        self.layer_speeds = 0.5 + 0.1 * np.arange(layers)
+        self.layer_alphas = 0.3 + 0.2 * np.arange(layers)
+
+        xi = (i + grid_size) // 2
+        yj = (j + grid_size) // 4
+        corner_x = np.stack((xi, xi + 1, xi + 1, xi), axis=-1)[:, None, :]
+        corner_y = np.stack((yj, yj, yj + 1, yj + 1), axis=-1)[None, :, :]
+        corner_x, corner_y = np.broadcast_arrays(corner_x, corner_y)
+        self.corners = (corner_x * len(self.ys) + corner_y).reshape(-1)
+        self.column = np.broadcast_to(np.arange(len(i))[:, None, None], corner_x.shape).reshape(-1)
+        self.mid_x = (self.xs[xi] + self.xs[xi + 1]) / 2
+
+        per_layer = len(self.corners)
+        self.vertices = np.empty((layers, per_layer, 3), dtype=np.float32)
+        self.vertices[:, :, 0] = self.xs[corner_x.reshape(-1)]
+        self.vertices[:, :, 1] = self.ys[corner_y.reshape(-1)]
+        self.colors = np.empty((layers, per_layer, 3), dtype=np.float32)
+        self.heights = np.empty((layers, len(self.xs), len(self.ys)))
+        self.column_colors = np.empty((layers, len(i), 3))
+
+    def update(self, time, opacity, color1, color2, brightness=1.2):
+        wave_time = time * self.layer_speeds[:, None]
+        heights = self.heights
+        np.add(self.layer_heights[:, None, None],
+               20 * np.sin(self.xs / 100 + wave_time)[:, :, None], out=heights)
+        heights += 15 * np.cos(self.ys / 120 + wave_time * 0.7)[:, None, :]
+        self.vertices[:, :, 2] = heights.reshape(self.layers, -1)[:, self.corners]
+
+        t = (np.sin(self.mid_x / 200 + wave_time) + 1) / 2
+        color1 = np.asarray(color1, dtype=np.float64)
+        color2 = np.asarray(color2, dtype=np.float64)
+        alpha = (opacity * self.layer_alphas)[:, None, None]
+        colors = self.column_colors
+        np.multiply(color1 + (color2 - color1) * t[:, :, None], brightness * alpha, out=colors)
+        colors += np.array([0.1, 0.2, 0.3]) * alpha
+        self.colors[...] = colors[:, self.column]
+        return self.vertices.reshape(-1, 3), self.colors.reshape(-1, 3)
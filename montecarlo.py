@@ -0,0 +1,184 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+import project_17 as game
+from headless import HeadlessEngine, load_script
+
+MOVE_KEYS = b'wasdqezc'
+
+
+def random_script(seed, ticks, move_chance=0.2, click_chance=0.15):
+    rng = random.Random(seed)
+    script = {}
+    for tick in range(ticks):
+        events = []
+        if rng.random() < move_chance:
+            events.append(('key', MOVE_KEYS[rng.randrange(len(MOVE_KEYS))].to_bytes(1, 'little')))
+        if rng.random() < click_chance:
+            events.append(('mouse', 'left'))
+        if events:
+            script[tick] = events
+    return script
+
+
+def parse_policy(spec):
+    name, _, arg = spec.partition(':')
+    if name == 'idle' and not arg:
+        return {'name': spec, 'autofire': 0, 'script': None}
+    if name == 'autofire':
+        interval = int(arg or 10)
+        if interval <= 0:
+            raise ValueError(f"policy '{spec}': autofire interval must be positive")
+        return {'name': spec, 'autofire': interval, 'script': None}
+    if name == 'random' and not arg:
+        return {'name': spec, 'autofire': 0, 'script': 'random'}
+    if name == 'script' and arg:
+        return {'name': spec, 'autofire': 0, 'script': load_script(arg)}
+    raise ValueError(f"unknown policy '{spec}' (expected idle, autofire[:N], random or script:PATH)")
+
+
+def play_game(job):
+    policy, seed, max_ticks, enemies, cheat_mode = job
+    script = policy['script']
+    if script == 'random':
+        script = random_script(seed, max_ticks)
+    engine = HeadlessEngine(script, autofire=policy['autofire'], cheat_mode=cheat_mode,
+                            seed=seed, enemies=enemies)
+    result = engine.run(ticks=max_ticks)
+    state = engine.state
+    if not state.game_over:
+        cause = None
+    elif state.player_missed_bullets >= 100:
+        cause = 'misses'
+    else:
+        cause = 'lives'
+    return {
+        'policy': policy['name'],
+        'seed': seed,
+        'ticks': result['ticks'],
+        'survival': result['ticks'] * game.SIM_DT,
+        'game_over': state.game_over,
+        'cause': cause,
+        'kills': state.enemies_killed,
+        'misses': state.player_missed_bullets,
+        'lives': state.player_lives,
+    }
+
+
+def summarize(games):
+    if not games:
+        return {'games': 0, 'survival': None, 'kills': None, 'misses': None, 'outcomes': {}}
+    survival = np.array([g['survival'] for g in games])
+    kills = np.array([g['kills'] for g in games])
+    misses = np.array([g['misses'] for g in games])
+    causes = {}
+    for g in games:
+        key = g['cause'] or 'time_limit'
+        causes[key] = causes.get(key, 0) + 1
+    return {
+        'games': len(games),
+        'survival': {
+            'mean': round(float(survival.mean()), 2),
+            'p10': round(float(np.percentile(survival, 10)), 2),
+            'p50': round(float(np.percentile(survival, 50)), 2),
+            'p90': round(float(np.percentile(survival, 90)), 2),
+        },
+        'kills': {'mean': round(float(kills.mean()), 2), 'max': int(kills.max())},
+        'misses': {'mean': round(float(misses.mean()), 2), 'max': int(misses.max())},
+        'outcomes': causes,
+    }
+
+
+def run_batch(policies, games, max_ticks, enemies=1, cheat_mode=False, seed=0, workers=None):
+    jobs = [(policy, seed + i, max_ticks, enemies, cheat_mode)
+            for policy in policies for i in range(games)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [play_game(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with multiprocessing.Pool(workers) as pool:
+            results = list(pool.imap_unordered(play_game, jobs, chunksize))
+    results.sort(key=lambda g: (g['policy'], g['seed']))
+    return results
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many headless games in parallel and report outcome statistics.")
+    parser.add_argument('--games', type=int, default=100, help="games per policy")
+    parser.add_argument('--policy', action='append', dest='policies', metavar='SPEC',
+                        help="idle, autofire[:N], random or script:PATH (repeatable, default autofire:10)")
+    parser.add_argument('--max-seconds', type=float, default=300.0, help="simulated time limit per game")
+    parser.add_argument('--enemies', type=int, default=1, help="number of enemy UFOs on the field")
+    parser.add_argument('--cheat', action='store_true', help="play with the shield (cheat mode) enabled")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument('--workers', type=positive_int, help="worker processes (default: all cores)")
+    parser.add_argument('--json', metavar='PATH', help="write the report as JSON ('-' for stdout)")
+    parser.add_argument('--games-detail', action='store_true', help="include every game's result in the JSON report")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    try:
+        policies = [parse_policy(spec) for spec in args.policies or ['autofire:10']]
+    except (ValueError, OSError) as exc:
+        parser.error(str(exc))
+
+    max_ticks = int(round(args.max_seconds / game.SIM_DT))
+    start = time.perf_counter()
+    results = run_batch(policies, args.games, max_ticks, args.enemies, args.cheat, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'games_per_policy': args.games,
+        'max_seconds': args.max_seconds,
+        'enemies': args.enemies,
+        'cheat_mode': args.cheat,
+        'seed': args.seed,
+        'elapsed': round(elapsed, 3),
+        'policies': {},
+    }
+    for policy in policies:
+        games = [g for g in results if g['policy'] == policy['name']]
+        report['policies'][policy['name']] = summarize(games)
+    if args.games_detail:
+        report['games'] = results
+
+    out = sys.stderr if args.json == '-' else sys.stdout
+    out.write(f"{len(results)} games in {elapsed:.1f}s\n")
+    for name, summary in report['policies'].items():
+        if summary['games'] == 0:
+            out.write(f"{name}: no games\n")
+            continue
+        survival = summary['survival']
+        outcomes = ', '.join(f"{cause} {count}" for cause, count in sorted(summary['outcomes'].items()))
+        out.write(f"{name}: survival mean {survival['mean']:.1f}s (p10 {survival['p10']:.1f}, "
+                  f"p50 {survival['p50']:.1f}, p90 {survival['p90']:.1f})  kills {summary['kills']['mean']:.2f}  "
+                  f"misses {summary['misses']['mean']:.1f}  [{outcomes}]\n")
+
+    if args.json:
+        if args.json == '-':
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
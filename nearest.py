@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+
+from spatial_hash import SpatialHash
+
+
+_annulus_cache = {}
+
+
+def annulus_offsets(inner, outer):
+    offsets = _annulus_cache.get((inner, outer))
+    if offsets is None:
+        span = np.arange(-outer, outer + 1, dtype=np.int64)
+        dx, dy = np.meshgrid(span, span, indexing='ij')
+        keep = np.maximum(np.abs(dx), np.abs(dy)) > inner
+        offsets = np.stack((dx[keep], dy[keep]), axis=1)
+        _annulus_cache[(inner, outer)] = offsets
+    return offsets
+
+
+class NearestNeighbours:
+    def __init__(self, extent, cell_size=64.0, points_per_cell=2.0, scan_limit=1024):
+        self.grid = SpatialHash(extent, cell_size)
+        self.min_cell_size = cell_size
+        self.points_per_cell = points_per_cell
+        self.scan_limit = scan_limit
+        self.points = np.empty((0, 3), dtype=np.float32)
+        self.mask = None
+        self.live = np.empty(0, dtype=np.int64)
+        self.stale = False
+
+    def update(self, points, mask=None):
+        self.points = points
+        self.mask = mask
+        self.stale = True
+
+    def _ensure_index(self):
+        if not self.stale:
+            return
+        self.live = np.arange(len(self.points)) if self.mask is None else np.flatnonzero(self.mask)
+        if len(self.live) > self.scan_limit:
+            cells_per_side = math.sqrt(len(self.live) / self.points_per_cell)
+            self.grid.min_cell_size = max(self.min_cell_size, 2 * self.grid.extent / cells_per_side)
+            self.grid.rebuild(self.points, np.zeros(len(self.points), dtype=np.float32), self.mask)
+        self.stale = False
+
+    def _scan(self, point, k, radius):
+        offsets = self.points[self.live] - point
+        distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+        indices = self.live
+        if radius != math.inf:
+            keep = distances <= radius
+            indices = indices[keep]
+            distances = distances[keep]
+        if len(indices) > k:
+            best = np.argpartition(distances, k - 1)[:k]
+            indices = indices[best]
+            distances = distances[best]
+        order = np.argsort(distances, kind='stable')
+        return indices[order], distances[order]
+
+    def _unsearched_distance(self, point, cx, cy, ring):
+        grid = self.grid
+        size = grid.cell_size
+        last = grid.dims - 1
+        x = float(point[0]) + grid.extent
+        y = float(point[1]) + grid.extent
+        bound = math.inf
+        if cx - ring > 0:
+            bound = min(bound, x - (cx - ring) * size)
+        if cx + ring < last:
+            bound = min(bound, (cx + ring + 1) * size - x)
+        if cy - ring > 0:
+            bound = min(bound, y - (cy - ring) * size)
+        if cy + ring < last:
+            bound = min(bound, (cy + ring + 1) * size - y)
+        return max(bound, 0.0)
+
+    def k_nearest(self, point, k=1, radius=math.inf):
+        self._ensure_index()
+        if len(self.live) == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        point = np.asarray(point, dtype=np.float32)
+        if len(self.live) <= self.scan_limit:
+            return self._scan(point, k, radius)
+
+        cx, cy = self.grid.cell_of(point)
+        cell = np.array((cx, cy), dtype=np.int64)
+        indices = np.empty(0, dtype=np.int64)
+        distances = np.empty(0, dtype=np.float32)
+        searched = -1
+        ring = 1
+        while True:
+            found = self.grid.items_in_cells(annulus_offsets(searched, ring) + cell)
+            if len(found):
+                offsets = self.points[found] - point
+                found_distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+                keep = found_distances <= radius
+                indices = np.concatenate((indices, found[keep]))
+                distances = np.concatenate((distances, found_distances[keep]))
+                if len(indices) > k:
+                    best = np.argpartition(distances, k - 1)[:k]
+                    indices = indices[best]
+                    distances = distances[best]
+
+            bound = self._unsearched_distance(point, cx, cy, ring)
+            if bound >= radius or (len(indices) == k and distances.max() <= bound):
+                break
+            searched = ring
+            ring *= 2
+
+        order = np.argsort(distances, kind='stable')
+        return indices[order], distances[order]
+
+    def nearest(self, point, radius=math.inf):
+        indices, distances = self.k_nearest(point, 1, radius)
+        if len(indices) == 0:
+            return -1, math.inf
+        return int(indices[0]), float(distances[0])
@@ -0,0 +1,103 @@
+import numpy as np
+
+PARTICLE_ARRAYS = ('pos', 'size', 'age', 'lifetime', 'alive', 'head', 'limit', 'in_use')
+# Emitting fewer particles than this is cheaper one at a time than through fancy indexing.
+SCALAR_EMIT_LIMIT = 16
+
+
+class ParticleSystem:
+    def __init__(self, emitters=32, slots=16, seed=None):
+        self.slots = slots
+        self.capacity = 0
+        self.rng = np.random.default_rng(seed)
+        self.free_emitters = []
+        self._allocate(max(1, emitters))
+
+    def _allocate(self, capacity):
+        old = self.capacity
+        grown = {
+            'pos': np.zeros((capacity, self.slots, 3), dtype=np.float32),
+            'size': np.zeros((capacity, self.slots), dtype=np.float32),
+            'age': np.zeros((capacity, self.slots), dtype=np.float32),
+            'lifetime': np.ones((capacity, self.slots), dtype=np.float32),
+            'alive': np.zeros((capacity, self.slots), dtype=bool),
+            'head': np.zeros(capacity, dtype=np.int32),
+            'limit': np.full(capacity, self.slots, dtype=np.int32),
+            'in_use': np.zeros(capacity, dtype=bool),
+        }
+        for name, column in grown.items():
+            if old:
+                column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        self.free_emitters[:0] = range(capacity - 1, old - 1, -1)
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def add_emitter(self, limit=None):
+        if not self.free_emitters:
+            self._allocate(self.capacity * 2)
+        emitter = self.free_emitters.pop()
+        self.in_use[emitter] = True
+        self.alive[emitter] = False
+        self.head[emitter] = 0
+        self.limit[emitter] = min(limit or self.slots, self.slots)
+        return emitter
+
+    def remove_emitter(self, emitter):
+        if self.in_use[emitter]:
+            self.in_use[emitter] = False
+            self.alive[emitter] = False
+            self.free_emitters.append(emitter)
+
+    def clear_emitter(self, emitter):
+        self.alive[emitter] = False
+        self.head[emitter] = 0
+
+    def clear(self):
+        self.alive[:] = False
+        self.in_use[:] = False
+        self.head[:] = 0
+        self.free_emitters = list(range(self.capacity - 1, -1, -1))
+
+    def restore(self, arrays, free_emitters):
+        capacity = len(arrays['head'])
+        if capacity > self.capacity:
+            self._allocate(capacity)
+        for name, values in arrays.items():
+            column = getattr(self, name)
+            column[:capacity] = values
+            column[capacity:] = 0
+        self.free_emitters = list(range(self.capacity - 1, capacity - 1, -1)) + list(free_emitters)
+
+    def emit(self, emitters, pos, size, lifetime):
+        if len(emitters) < SCALAR_EMIT_LIMIT:
+            head = self.head
+            limit = self.limit
+            for emitter, p, s, t in zip(emitters.tolist(), pos.tolist(), size.tolist(), lifetime.tolist()):
+                slot = int(head[emitter])
+                self.pos[emitter, slot] = p
+                self.size[emitter, slot] = s
+                self.age[emitter, slot] = 0.0
+                self.lifetime[emitter, slot] = t
+                self.alive[emitter, slot] = True
+                head[emitter] = (slot + 1) % int(limit[emitter])
+            return
+        slots = self.head[emitters]
+        cells = emitters * self.slots + slots
+        self.pos.reshape(-1, 3)[cells] = pos
+        self.size.reshape(-1)[cells] = size
+        self.age.reshape(-1)[cells] = 0.0
+        self.lifetime.reshape(-1)[cells] = lifetime
+        self.alive.reshape(-1)[cells] = True
+        self.head[emitters] = (slots + 1) % self.limit[emitters]
+
+    def update(self, dt, shrink_rate=0.5):
+        self.age += np.float32(dt)
+        self.alive &= self.age <= self.lifetime
+        self.size *= np.float32(1.0 - dt * shrink_rate)
+
+    def live_particles(self):
+        alive = self.alive
+        return self.pos[alive], self.size[alive], self.age[alive]
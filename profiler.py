@@ -0,0 +1,167 @@
+import time
+
+import numpy as np
+
+PHASES = ('update', 'background', 'asteroids', 'fighters', 'effects', 'hud')
+
+
+def _sphere_vertices(radius, slices, stacks):
+    return 2 * (slices + 1) * stacks
+
+
+def _cone_vertices(base, height, slices, stacks):
+    return 2 * (slices + 1) * stacks + slices + 2
+
+
+def _torus_vertices(inner, outer, sides, rings):
+    return 2 * (sides + 1) * rings
+
+
+VERTEX_COUNTS = {
+    'glVertex2f': lambda *args: 1,
+    'glVertex3f': lambda *args: 1,
+    'glDrawArrays': lambda mode, first, count: count,
+    'glutSolidSphere': _sphere_vertices,
+    'glutSolidCone': _cone_vertices,
+    'glutSolidTorus': _torus_vertices,
+    'glutSolidCube': lambda size: 24,
+}
+DRAW_CALLS = ('glBegin', 'glDrawArrays', 'glCallList',
+              'glutSolidSphere', 'glutSolidCone', 'glutSolidTorus', 'glutSolidCube')
+
+
+def count_vertices(namespace, func, *args):
+    total = 0
+    originals = {}
+
+    def counting(name, func):
+        def counted(*args):
+            nonlocal total
+            total += VERTEX_COUNTS[name](*args)
+            return func(*args)
+        return counted
+
+    for name in VERTEX_COUNTS:
+        if name in namespace:
+            originals[name] = namespace[name]
+            # Count through to the real call, past any profiler wrapper.
+            namespace[name] = counting(name, getattr(namespace[name], '__wrapped__', namespace[name]))
+    try:
+        func(*args)
+    finally:
+        namespace.update(originals)
+    return total
+
+
+class FrameProfiler:
+    def __init__(self, history=240, smoothing=0.1, refresh_interval=0.5, clock=time.perf_counter,
+                 list_vertices=None):
+        self.enabled = False
+        self.list_vertices = {} if list_vertices is None else list_vertices
+        self.clock = clock
+        self.smoothing = smoothing
+        self.refresh_interval = refresh_interval
+        self.frame_times = np.zeros(history)
+        self.frames = 0
+        self.frame_start = None
+        self.mark = None
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.phase_averages = dict.fromkeys(PHASES, 0.0)
+        self.vertices = 0
+        self.draw_calls = 0
+        self.frame_vertices = 0
+        self.frame_draw_calls = 0
+        self.last_refresh = float('-inf')
+        self.lines = []
+        self._originals = {}
+
+    def toggle(self, namespace):
+        if self.enabled:
+            self.disable(namespace)
+        else:
+            self.enable(namespace)
+
+    def enable(self, namespace):
+        self.enabled = True
+        self.frames = 0
+        self.frame_start = None
+        self.lines = []
+        self.last_refresh = float('-inf')
+        for name in set(VERTEX_COUNTS) | set(DRAW_CALLS):
+            if name in namespace:
+                self._originals[name] = namespace[name]
+                namespace[name] = self._counting(name, namespace[name])
+
+    def disable(self, namespace):
+        self.enabled = False
+        namespace.update(self._originals)
+        self._originals.clear()
+
+    def _counting(self, name, func):
+        if name == 'glCallList':
+            vertices = lambda list_id: self.list_vertices.get(list_id, 0)
+        else:
+            vertices = VERTEX_COUNTS.get(name)
+        draw_call = name in DRAW_CALLS
+
+        def counted(*args):
+            if vertices is not None:
+                self.vertices += vertices(*args)
+            if draw_call:
+                self.draw_calls += 1
+            return func(*args)
+        counted.__wrapped__ = func
+        return counted
+
+    def add(self, phase, seconds):
+        if self.enabled:
+            self.phase_times[phase] += seconds
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = self.clock()
+        if self.frame_start is not None:
+            self.frame_times[self.frames % len(self.frame_times)] = now - self.frame_start
+            self.frames += 1
+        self.frame_start = now
+        self.mark = now
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = self.clock()
+        self.phase_times[phase] += now - self.mark
+        self.mark = now
+
+    def end_frame(self, counts):
+        if not self.enabled:
+            return
+        for phase in PHASES:
+            average = self.phase_averages[phase]
+            self.phase_averages[phase] = average + (self.phase_times[phase] - average) * self.smoothing
+            self.phase_times[phase] = 0.0
+        self.frame_vertices = self.vertices
+        self.frame_draw_calls = self.draw_calls
+        self.vertices = 0
+        self.draw_calls = 0
+
+        now = self.clock()
+        if now - self.last_refresh >= self.refresh_interval:
+            self.last_refresh = now
+            self.lines = self.report(counts)
+
+    def report(self, counts):
+        lines = []
+        history = self.frame_times[:min(self.frames, len(self.frame_times))] * 1000.0
+        if len(history):
+            p50, p95, p99 = np.percentile(history, (50, 95, 99))
+            lines.append(f"FPS: {1000.0 / history.mean():.1f}")
+            lines.append(f"Frame ms p50/p95/p99: {p50:.1f}/{p95:.1f}/{p99:.1f}")
+        else:
+            lines.append("FPS: --")
+        for phase in PHASES:
+            lines.append(f"{phase:<11}{self.phase_averages[phase] * 1000.0:6.2f} ms")
+        lines.append(f"Vertices: {self.frame_vertices}  Draws: {self.frame_draw_calls}")
+        lines.extend(f"{name}: {count}" for name, count in counts.items())
+        return lines
@@ -1,10 +1,78 @@
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
+import argparse
 import random
 import math
 import time
 
+import numpy as np
+
+from collision import swept_sphere_contacts
+from entities import Asteroid, Bullet, Enemy, EnemyBullet, Explosion, LifeGift, Planet, Star
+from entity_store import NO_ROW, EntityStore
+from meshes import AuroraMesh, sphere_line_vertices, torus_triangles
+from nearest import NearestNeighbours
+from particles import ParticleSystem
+from profiler import FrameProfiler, count_vertices
+from replay import InputRecorder, replay_seed
+from snapshot import load_snapshot, save_snapshot
+from spawn import SpawnSampler
+from spatial_hash import SpatialHash
+from sweep_prune import SweepAndPrune
+from timestep import FixedTimestep, SimulationClock
+from tracer import Tracer
+
+ASTEROID_FIELDS = {
+    'type': ((), np.int8),
+    'heat_level': ((), np.float32),
+    'emitter': ((), np.int32),
+}
+PLAYER_BULLET_FIELDS = {
+    'is_helper': ((), np.bool_),
+}
+ENEMY_BULLET_FIELDS = {
+    'direction': ((3,), np.float32),
+    'style': ((), np.int8),
+    'color': ((3,), np.float32),
+}
+ENEMY_FIELDS = {
+    'target': ((3,), np.float32),
+    'lives': ((), np.int16),
+    'max_lives': ((), np.int16),
+    'evolution': ((), np.int8),
+    'color': ((3,), np.float32),
+    'bullet_color': ((3,), np.float32),
+    'shooting_style': ((), np.int8),
+    'speed': ((), np.float32),
+    'teleport_time': ((), np.float64),
+    'teleport_interval': ((), np.float32),
+    'visible': ((), np.bool_),
+}
+LIFE_GIFT_FIELDS = {
+    'age': ((), np.float32),
+}
+EXPLOSION_FIELDS = {
+    'age': ((), np.float32),
+    'duration': ((), np.float32),
+}
+
+POOL_CAPACITIES = {
+    'player_bullets': (512, 'recycle'),
+    'enemy_bullets': (512, 'recycle'),
+    'explosions': (128, 'recycle'),
+    'asteroids': (32, 'grow'),
+    'life_gifts': (8, 'grow'),
+    'enemies': (8, 'grow'),
+}
+TRAIL_EMITTERS = 32
+TRAIL_SLOTS = 16
+
+
+def make_store(name, fields, entity_type):
+    capacity, overflow = POOL_CAPACITIES[name]
+    return EntityStore(capacity, fields, overflow, entity_type)
+
 class AlphaRenderer:
     def __init__(self):
         self.effect_type = "none"
@@ -38,17 +106,98 @@ class AlphaRenderer:
             glColor3f(r, g, b)
 
 alpha_fx = AlphaRenderer()
+
+
+class DisplayListCache:
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.lists = {}
+        self.vertices = {}
+
+    def draw(self, key, build, *args):
+        list_id = self.lists.get(key)
+        if list_id is None:
+            list_id = glGenLists(1)
+            glNewList(list_id, GL_COMPILE)
+            self.vertices[list_id] = count_vertices(self.namespace, build, *args)
+            glEndList()
+            self.lists[key] = list_id
+        glCallList(list_id)
+
+
+def emit_vertex_array(mode, vertices, normals=None):
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices)
+    if normals is not None:
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glNormalPointer(GL_FLOAT, 0, normals)
+    glDrawArrays(mode, 0, len(vertices))
+    if normals is not None:
+        glDisableClientState(GL_NORMAL_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+display_lists = DisplayListCache(globals())
+profiler = FrameProfiler(list_vertices=display_lists.vertices)
+aurora_mesh = AuroraMesh()
+class Scene:
+    def __init__(self, rng):
+        self.stars = []
+        for _ in range(300):
+            self.stars.append(Star(
+                rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), rng.uniform(-800, -200),
+                brightness=rng.uniform(0.5, 1.0),
+                blink_rate=rng.uniform(0.5, 2.0)
+            ))
+
+        self.planets = []
+        for _ in range(15):
+            self.planets.append(Planet(
+                rng.uniform(-1500, 1500), rng.uniform(-1500, 1500), rng.uniform(-700, -300),
+                size=rng.uniform(20, 80),
+                color=(rng.uniform(0.2, 0.8), rng.uniform(0.2, 0.8), rng.uniform(0.2, 0.8)),
+                rings=rng.random() > 0.7,
+                ring_color=(rng.uniform(0.2, 0.9), rng.uniform(0.2, 0.9), rng.uniform(0.2, 0.9)),
+                rotation=rng.uniform(0, 360),
+                rotation_speed=rng.uniform(0.01, 0.05) * (1 if rng.random() > 0.5 else -1)
+            ))
+
+
 class GameState:
-    def __init__(self):
+    def __init__(self, rng=None, clock=None, scene=None, enemy_count=1):
+        self.rng = rng if rng is not None else random.Random()
+        self.clock = clock if clock is not None else SimulationClock()
+        self.scene = scene if scene is not None else Scene(self.rng)
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.enemy_count = enemy_count
+
+        self.player_bullets = make_store('player_bullets', PLAYER_BULLET_FIELDS, Bullet)
+        self.enemy_bullets = make_store('enemy_bullets', ENEMY_BULLET_FIELDS, EnemyBullet)
+        self.life_gifts = make_store('life_gifts', LIFE_GIFT_FIELDS, LifeGift)
+        self.explosions = make_store('explosions', EXPLOSION_FIELDS, Explosion)
+        self.asteroids = make_store('asteroids', ASTEROID_FIELDS, Asteroid)
+        self.enemies = make_store('enemies', ENEMY_FIELDS, Enemy)
+        self.trails = ParticleSystem(TRAIL_EMITTERS, TRAIL_SLOTS, seed=self.rng.getrandbits(64))
+        self.spawner = SpawnSampler(seed=self.rng.getrandbits(64))
+        self.reset()
+
+    def reset(self):
+        self.player_bullets.clear()
+        self.enemy_bullets.clear()
+        self.life_gifts.clear()
+        self.explosions.clear()
+        self.asteroids.clear()
+        self.enemies.clear()
+        self.trails.clear()
+
         self.player_pos = [0, 0, 50]
         self.player_direction = [0, 1, 0]
         self.player_lives = 9
-        self.player_bullets = []
         self.player_missed_bullets = 0
         self.player_bullet_count = 1
         self.player_shooting_speed = 1.0
         self.first_person_mode = False
-        self.last_shield_hit = 0.0
+        self.last_shield_hit = float('-inf')
         self.player_flicker = False
         self.flicker_start_time = 0
         self.flicker_duration = 0.5
@@ -61,11 +210,9 @@ class GameState:
         self.enemies_killed = 0
         self.helper_active = False
         self.helper_offset = [-30, 0, 0]
-        self.helper_target = None
-        self.helper_last_shot_time = 0
+        self.helper_last_shot_time = float('-inf')
         self.helper_shooting_interval = 1.0
 
-        self.life_gifts = []
         self.gift_pulse = 0
 
         self.paused = False
@@ -78,92 +225,77 @@ class GameState:
         self.countdown_interval = 1.0
         self.resume_message_duration = 2.0
 
-        self.enemy_pos = self.generate_random_position(upper_area_only=True)
-        self.enemy_lives = 1
-        self.enemy_bullets = []
-        self.enemy_shooting_style = 0
-        self.enemy_bullet_color = [1.0, 0.0, 0.0]
-        self.enemy_max_lives = 1
-        self.enemy_color = [0.5, 0.5, 0.5]
-        self.enemy_evolution = 0
-        self.enemy_size = 2.0
-
-        self.enemy_speed = 1.0
-        self.enemy_direction = [random.uniform(-1, 1), random.uniform(-1, 1), 0]
-        self.enemy_teleport_time = time.time()
-        self.enemy_teleport_interval = 5.0
-        self.enemy_visible = True
-        self.enemy_target_pos = self.generate_random_position(upper_area_only=True)
-
-        self.explosions = []
-
-        self.asteroids = []
-        for _ in range(10):
-            vel_x = random.uniform(-3.0, 3.0)
-            vel_y = random.uniform(-3.0, 3.0)
+        self.spawn_enemies(self.enemy_count)
+
+        for pos in self.generate_random_positions(10).tolist():
+            vel_x = self.rng.uniform(-3.0, 3.0)
+            vel_y = self.rng.uniform(-3.0, 3.0)
             if abs(vel_x) < 1.0: vel_x *= 2.0
             if abs(vel_y) < 1.0: vel_y *= 2.0
 
-            self.asteroids.append({
-                'pos': self.generate_random_position(),
-                'size': random.uniform(8, 18),
-                'type': random.randint(0, 2),
-                'rotation': [random.uniform(0, 360), random.uniform(0, 360), random.uniform(0, 360)],
-                'rotation_speed': [random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)],
-                'velocity': [vel_x, vel_y, 0],
-                'trail_particles': [],
-                'heat_level': random.uniform(0.7, 1.0)
-            })
-
-        self.stars = []
-        for _ in range(300):
-            self.stars.append({
-                'pos': [random.uniform(-2000, 2000), random.uniform(-2000, 2000), random.uniform(-800, -200)],
-                'brightness': random.uniform(0.5, 1.0),
-                'blink_rate': random.uniform(0.5, 2.0)
-            })
-
-        self.planets = []
-        for _ in range(15):
-            self.planets.append({
-                'pos': [random.uniform(-1500, 1500), random.uniform(-1500, 1500), random.uniform(-700, -300)],
-                'size': random.uniform(20, 80),
-                'color': [random.uniform(0.2, 0.8), random.uniform(0.2, 0.8), random.uniform(0.2, 0.8)],
-                'rings': random.random() > 0.7,
-                'ring_color': [random.uniform(0.2, 0.9), random.uniform(0.2, 0.9), random.uniform(0.2, 0.9)],
-                'rotation': random.uniform(0, 360),
-                'rotation_speed': random.uniform(0.01, 0.05) * (1 if random.random() > 0.5 else -1)
-            })
+            self.add_asteroid(pos, self.rng.uniform(8, 18),
+                              self.rng.randint(0, 2), [vel_x, vel_y, 0], self.rng.uniform(0.7, 1.0))
 
         self.aurora_effect = False
         self.aurora_time = 0
         self.aurora_colors = []
 
-        self.last_shot_time = 0
+        self.last_shot_time = float('-inf')
         self.game_over = False
 
-    def generate_random_position(self, upper_area_only=False):
+    def add_asteroid(self, pos, size, asteroid_type, velocity, heat_level):
+        return self.asteroids.add(
+            pos=pos,
+            size=size,
+            type=asteroid_type,
+            velocity=velocity,
+            rotation=[self.rng.uniform(0, 360) for _ in range(3)],
+            rotation_speed=[self.rng.uniform(-2, 2) for _ in range(3)],
+            heat_level=heat_level,
+            emitter=self.trails.add_emitter(15 if size > 15 else 8)
+        )
+
+    def clear_trail(self, row):
+        self.trails.clear_emitter(int(self.asteroids.emitter[row]))
+
+    def remove_asteroid(self, row):
+        self.trails.remove_emitter(int(self.asteroids.emitter[row]))
+        self.asteroids.kill(row)
+
+    def spawn_enemies(self, count):
+        spots = self.generate_random_positions(2 * count, upper_area_only=True)
+        now = self.clock()
+        for i in range(count):
+            self.enemies.add(
+                pos=spots[i],
+                target=spots[count + i],
+                size=2.0,
+                lives=1,
+                max_lives=1,
+                evolution=0,
+                color=self.generate_enemy_color(0),
+                bullet_color=[1.0, 0.0, 0.0],
+                shooting_style=0,
+                speed=1.0,
+                teleport_time=now - 5.0 * i / count,
+                teleport_interval=5.0,
+                visible=True
+            )
+
+    def add_explosion(self, pos, size, duration):
+        return self.explosions.add(pos=pos, size=size, age=0.0, duration=duration)
+
+    def generate_random_positions(self, count, upper_area_only=False, exclusions=()):
         safe_boundary_x = GRID_LENGTH * 0.8
-        if upper_area_only:
-            y_min = -0.2 * GRID_LENGTH
-            y_max = safe_boundary_x
-        else:
-            y_min = -safe_boundary_x
-            y_max = safe_boundary_x
-        pos = [random.uniform(-safe_boundary_x, safe_boundary_x),
-               random.uniform(y_min, y_max),
-               random.uniform(30, 80)]
-
-        while True:
-            distance = math.sqrt((pos[0] - self.player_pos[0]) ** 2 +
-                                 (pos[1] - self.player_pos[1]) ** 2 +
-                                 (pos[2] - self.player_pos[2]) ** 2)
-            if distance > 150:
-                return pos
-
-            pos = [random.uniform(-safe_boundary_x, safe_boundary_x),
-                   random.uniform(y_min, y_max),
-                   random.uniform(30, 80)]
+        y_min = -0.2 * GRID_LENGTH if upper_area_only else -safe_boundary_x
+        low = (-safe_boundary_x, y_min, 30)
+        high = (safe_boundary_x, safe_boundary_x, 80)
+        zones = [(self.player_pos, 150)]
+        zones.extend(exclusions)
+        return self.spawner.sample(count, low, high, zones)
+
+    def generate_random_position(self, upper_area_only=False):
+        return self.generate_random_positions(1, upper_area_only)[0].tolist()
 
     def generate_enemy_color(self, evolution_level):
         if evolution_level == 0:
@@ -180,7 +312,7 @@ class GameState:
     def generate_random_aurora_colors(self):
         colors = []
         for _ in range(5):
-            hue = random.random()
+            hue = self.rng.random()
             h = hue * 6.0
             i = int(h)
             f = h - i
@@ -210,7 +342,20 @@ WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 960
 GRID_LENGTH = 1000
 
+SIM_DT = 1.0 / 60.0
+MAX_STEPS_PER_FRAME = 5
+SNAPSHOT_PATH = 'quicksave.snap'
+
+PLAYER_BULLET_SPEED = 8.0
+HELPER_BULLET_SPEED = 6.0
+
+asteroid_grid = SpatialHash(GRID_LENGTH)
+asteroid_neighbours = NearestNeighbours(GRID_LENGTH)
+bullet_sweep = SweepAndPrune()
+sim_clock = FixedTimestep(SIM_DT, MAX_STEPS_PER_FRAME)
+
 game_state = GameState()
+input_recorder = None
 
 camera_pos = [0, -800, 800]
 fovY = 65
@@ -249,13 +394,15 @@ def draw_hud_text():
     draw_hud_line(current_y, f"Bullets Missed: {game_state.player_missed_bullets}/100")
     current_y -= line_height
 
-    draw_hud_line(current_y, f"Enemy Lives: {game_state.enemy_lives}")
+    enemies = game_state.enemies
+    live = enemies.alive[:enemies.count]
+    draw_hud_line(current_y, f"Enemy Lives: {int(enemies.lives[:enemies.count][live].sum())}")
     current_y -= line_height
 
     draw_hud_line(current_y, f"Bullet Count: {game_state.player_bullet_count}")
     current_y -= line_height
 
-    draw_hud_line(current_y, f"Enemy Evolution: {game_state.enemy_evolution}")
+    draw_hud_line(current_y, f"Enemy Evolution: {int(enemies.evolution[:enemies.count][live].max(initial=0))}")
     current_y -= line_height
 
     draw_hud_line(current_y, f"Enemies Killed: {game_state.enemies_killed}")
@@ -277,6 +424,45 @@ def draw_hud_text():
     glMatrixMode(GL_MODELVIEW)
 
 
+def draw_profiler_overlay():
+    profiler.lap('hud')
+    profiler.end_frame({
+        'Asteroids': len(game_state.asteroids),
+        'Trail particles': len(game_state.trails),
+        'Enemies': len(game_state.enemies),
+        'Player bullets': len(game_state.player_bullets),
+        'Enemy bullets': len(game_state.enemy_bullets),
+        'Explosions': len(game_state.explosions),
+        'Life gifts': len(game_state.life_gifts),
+    })
+
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    glOrtho(0.0, WINDOW_WIDTH, 0.0, WINDOW_HEIGHT, -1.0, 1.0)
+
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    left_margin = WINDOW_WIDTH - 300
+    current_y = WINDOW_HEIGHT - 30
+    for line in profiler.lines:
+        glColor3f(0.0, 0.0, 0.0)
+        glRasterPos2i(left_margin + 1, current_y - 1)
+        for char in line:
+            glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
+        glColor3f(0.4, 1.0, 0.4)
+        glRasterPos2f(left_margin, current_y)
+        for char in line:
+            glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
+        current_y -= 18
+
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+
+
 def draw_text_2d(x, y, text, font=GLUT_BITMAP_HELVETICA_18, r=1.0, g=1.0, b=1.0):
     glMatrixMode(GL_PROJECTION)
     glPushMatrix()
@@ -303,14 +489,8 @@ def draw_centered_text_2d(text, y_offset=0, font=GLUT_BITMAP_TIMES_ROMAN_24, r=1
 
 
 def draw_stealth_fighter(damaged_state=0, is_helper=False):
-    glPushMatrix()
-    if is_helper:
-        glScalef(0.7, 0.7, 0.7)
-    else:
-        glScalef(1.5, 1.5, 1.5)
-
     if game_state.player_flicker and not is_helper:
-        elapsed = time.time() - game_state.flicker_start_time
+        elapsed = game_state.clock() - game_state.flicker_start_time
         if elapsed < game_state.flicker_duration:
             flicker_speed = 15.0
             if int(elapsed * flicker_speed) % 2 == 0:
@@ -333,6 +513,16 @@ def draw_stealth_fighter(damaged_state=0, is_helper=False):
             elif damaged_state == 2:
                 glColor3f(0.6, 0.2, 0.2)
 
+    display_lists.draw(('fighter', damaged_state, is_helper), build_stealth_fighter, damaged_state, is_helper)
+
+
+def build_stealth_fighter(damaged_state, is_helper):
+    glPushMatrix()
+    if is_helper:
+        glScalef(0.7, 0.7, 0.7)
+    else:
+        glScalef(1.5, 1.5, 1.5)
+
     glPushMatrix()
     glScalef(1.5, 3, 0.4)
     glBegin(GL_QUADS)
@@ -494,38 +684,19 @@ def draw_stealth_fighter(damaged_state=0, is_helper=False):
     glPopMatrix()
 
 def draw_wireframe_sphere(radius, lats, longs):
-    vertices = []
-    for i in range(lats + 1):
-        lat = math.pi * (-0.5 + float(i) / lats)
-        z = math.sin(lat)
-        zr = math.cos(lat)
-
-        for j in range(longs + 1):
-            lng = 2 * math.pi * float(j) / longs
-            x = math.cos(lng) * zr
-            y = math.sin(lng) * zr
-            vertices.append((x * radius, y * radius, z * radius))
-    glBegin(GL_LINES)
-    for i in range(lats + 1):
-        for j in range(longs):
-            idx1 = i * (longs + 1) + j
-            idx2 = i * (longs + 1) + j + 1
-            glVertex3f(*vertices[idx1])
-            glVertex3f(*vertices[idx2])
-    glEnd()
-    glBegin(GL_LINES)
-    for i in range(lats):
-        for j in range(longs + 1):
-            idx1 = i * (longs + 1) + j
-            idx2 = (i + 1) * (longs + 1) + j
-            glVertex3f(*vertices[idx1])
-            glVertex3f(*vertices[idx2])
-    glEnd()
+    glPushMatrix()
+    glScalef(radius, radius, radius)
+    display_lists.draw(('sphere', lats, longs), build_wireframe_sphere, lats, longs)
+    glPopMatrix()
+
+
+def build_wireframe_sphere(lats, longs):
+    emit_vertex_array(GL_LINES, sphere_line_vertices(lats, longs))
 
 
 def draw_shield():
     alpha_fx.start_effect("glow", brightness=1.8)
-    time_factor = time.time() * 2.5
+    time_factor = game_state.clock() * 2.5
     pulse_primary = 0.7 + 0.3 * math.sin(time_factor)
     pulse_secondary = 0.7 + 0.3 * math.sin(time_factor * 1.3 + 0.7)
 
@@ -549,8 +720,8 @@ def draw_shield():
     num_rings = 3
     for i in range(num_rings):
         ring_opacity = shield_opacity * (0.7 - i * 0.1) * pulse_secondary
-        angle_x = (time.time() * 15 + i * 40) % 360
-        angle_z = (time.time() * 20 + i * 60) % 360
+        angle_x = (game_state.clock() * 15 + i * 40) % 360
+        angle_z = (game_state.clock() * 20 + i * 60) % 360
 
         glPushMatrix()
         glRotatef(angle_x, 1, 0, 0)
@@ -567,7 +738,7 @@ def draw_shield():
     num_sparkles = 15
     for i in range(num_sparkles):
         angle1 = i * 137.5
-        angle2 = i * 94.2 + time.time() * 20
+        angle2 = i * 94.2 + game_state.clock() * 20
         rad1 = math.radians(angle1)
         rad2 = math.radians(angle2)
         x = math.sin(rad1) * math.cos(rad2) * game_state.shield_radius
@@ -575,7 +746,7 @@ def draw_shield():
         z = math.cos(rad1) * game_state.shield_radius
         glPushMatrix()
         glTranslatef(x, y, z)
-        sparkle_size = 2.0 + 1.0 * math.sin(time.time() * 3.0 + i * 0.5)
+        sparkle_size = 2.0 + 1.0 * math.sin(game_state.clock() * 3.0 + i * 0.5)
         alpha_fx.set_color(1.0, 1.0, 1.0, 0.7 * pulse_secondary)
         glBegin(GL_LINES)
         glVertex3f(-sparkle_size, 0, 0)
@@ -587,8 +758,8 @@ def draw_shield():
         glEnd()
 
         glPopMatrix()
-    if hasattr(game_state, 'last_shield_hit') and time.time() - game_state.last_shield_hit < 0.8:
-        hit_progress = (time.time() - game_state.last_shield_hit) / 0.8
+    if hasattr(game_state, 'last_shield_hit') and game_state.clock() - game_state.last_shield_hit < 0.8:
+        hit_progress = (game_state.clock() - game_state.last_shield_hit) / 0.8
         ripple_size = hit_progress * 0.5
         ripple_opacity = (1.0 - hit_progress) * 0.9
         alpha_fx.set_color(0.7, 0.9, 1.0, ripple_opacity)
@@ -604,12 +775,9 @@ def draw_shield():
     alpha_fx.end_effect()
 
 
-def draw_ufo_enemy(damage_level=0, color=[0.5, 0.5, 0.5]):
-    if not game_state.enemy_visible:
-        return
-
+def draw_ufo_enemy(damage_level=0, color=[0.5, 0.5, 0.5], size=2.0):
     glPushMatrix()
-    glScalef(game_state.enemy_size, game_state.enemy_size, game_state.enemy_size)
+    glScalef(size, size, size)
     r, g, b = color
     if damage_level == 0:
         glColor3f(r, g, b)
@@ -617,11 +785,7 @@ def draw_ufo_enemy(damage_level=0, color=[0.5, 0.5, 0.5]):
         glColor3f(r * 0.8, g * 0.8, b * 0.8)
     else:
         glColor3f(r * 0.6, g * 0.6, b * 0.6)
-
-    glPushMatrix()
-    glRotatef(90, 1, 0, 0)
-    draw_solid_torus(7, 20, 20, 20)
-    glPopMatrix()
+    display_lists.draw('ufo_hull', build_ufo_hull)
 
     if damage_level == 0:
         glColor3f(min(r + 0.2, 1.0), min(g + 0.2, 1.0), min(b + 0.2, 1.0))
@@ -629,73 +793,91 @@ def draw_ufo_enemy(damage_level=0, color=[0.5, 0.5, 0.5]):
         glColor3f(min(r + 0.1, 1.0), min(g + 0.1, 1.0), min(b + 0.1, 1.0))
     else:
         glColor3f(r, g, b)
+    display_lists.draw('ufo_dome', build_ufo_dome)
 
+    light_count = 8 - int(damage_level * 5)
+    glColor3f(1.0 - r * 0.5, 1.0 - g * 0.5, 1.0 - b * 0.5)
+    display_lists.draw(('ufo_lights', light_count), build_ufo_lights, light_count)
+
+    if damage_level < 0.8:
+        glColor3f(1.0 - r * 0.7, 1.0 - g * 0.7, 1.0 - b * 0.7)
+        display_lists.draw('ufo_beam', build_ufo_beam)
+
+    glPopMatrix()
+
+
+def build_ufo_hull():
+    glPushMatrix()
+    glRotatef(90, 1, 0, 0)
+    build_solid_torus(7, 20, 20, 20)
+    glPopMatrix()
+
+
+def build_ufo_dome():
     glPushMatrix()
     glTranslatef(0, 0, 7)
     glScalef(1, 1, 0.5)
     glutSolidSphere(15, 20, 10)
     glPopMatrix()
 
-    light_count = 8 - int(damage_level * 5)
+
+def build_ufo_lights(light_count):
     for i in range(light_count):
         angle = i * (360.0 / light_count)
         glPushMatrix()
         glRotatef(angle, 0, 0, 1)
         glTranslatef(18, 0, -3)
-
-        glColor3f(1.0 - r * 0.5, 1.0 - g * 0.5, 1.0 - b * 0.5)
-
         glutSolidSphere(3, 10, 10)
         glPopMatrix()
-    if damage_level < 0.8:
-        intensity = 0.9 - damage_level * 0.5
-        glColor3f(1.0 - r * 0.7, 1.0 - g * 0.7, 1.0 - b * 0.7)
-        glPushMatrix()
-        glTranslatef(0, 0, -5)
-
-        radius = 5.0
-        height = 5.0
-        slices = 10
-
-        glBegin(GL_TRIANGLE_FAN)
-        glVertex3f(0.0, 0.0, 0.0)
-        for i in range(slices + 1):
-            angle = 2.0 * math.pi * i / slices
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            glVertex3f(x, y, 0.0)
-        glEnd()
 
-        glBegin(GL_TRIANGLES)
-        for i in range(slices):
-            angle1 = 2.0 * math.pi * i / slices
-            angle2 = 2.0 * math.pi * (i + 1) / slices
 
-            x1 = radius * math.cos(angle1)
-            y1 = radius * math.sin(angle1)
+def build_ufo_beam():
+    glPushMatrix()
+    glTranslatef(0, 0, -5)
+
+    radius = 5.0
+    height = 5.0
+    slices = 10
+
+    glBegin(GL_TRIANGLE_FAN)
+    glVertex3f(0.0, 0.0, 0.0)
+    for i in range(slices + 1):
+        angle = 2.0 * math.pi * i / slices
+        x = radius * math.cos(angle)
+        y = radius * math.sin(angle)
+        glVertex3f(x, y, 0.0)
+    glEnd()
+
+    glBegin(GL_TRIANGLES)
+    for i in range(slices):
+        angle1 = 2.0 * math.pi * i / slices
+        angle2 = 2.0 * math.pi * (i + 1) / slices
 
-            x2 = radius * math.cos(angle2)
-            y2 = radius * math.sin(angle2)
+        x1 = radius * math.cos(angle1)
+        y1 = radius * math.sin(angle1)
 
-            glVertex3f(0.0, 0.0, -height)
+        x2 = radius * math.cos(angle2)
+        y2 = radius * math.sin(angle2)
 
-            glVertex3f(x1, y1, 0.0)
-            glVertex3f(x2, y2, 0.0)
-        glEnd()
+        glVertex3f(0.0, 0.0, -height)
 
-        glPopMatrix()
+        glVertex3f(x1, y1, 0.0)
+        glVertex3f(x2, y2, 0.0)
+    glEnd()
 
     glPopMatrix()
+
+
 def draw_life_gift(gift):
 
     glPushMatrix()
-    glTranslatef(gift['pos'][0], gift['pos'][1], gift['pos'][2])
+    glTranslatef(*gift.pos.tolist())
 
     gift_scale = 5.0
     glScalef(gift_scale, gift_scale, gift_scale)
 
     rotation_speed = 90
-    angle = (time.time() * rotation_speed) % 360
+    angle = (game_state.clock() * rotation_speed) % 360
     glRotatef(angle, 0, 0, 1)
 
     pulse_factor = 0.3 * math.sin(game_state.gift_pulse) + 0.7
@@ -742,36 +924,41 @@ def draw_life_gift(gift):
     glPopMatrix()
 
 
-def draw_asteroid_trail(particles):
-    for particle in particles:
-        alpha = 1.0 - particle['age']
+def draw_asteroid_trails():
+    pos, size, age = game_state.trails.live_particles()
+    if len(age) == 0:
+        return
 
-        if particle['age'] < 0.3:
-            glColor3f(1.0 * alpha, 1.0 * alpha, 0.8 * alpha)
-        elif particle['age'] < 0.6:
-            scaled_alpha = alpha * 0.8
-            glColor3f(1.0 * scaled_alpha, 0.6 * scaled_alpha, 0.0)
-        else:
-            scaled_alpha = alpha * 0.6
-            glColor3f(0.8 * scaled_alpha, 0.2 * scaled_alpha, 0.0)
+    alpha = 1.0 - age
+    scale = np.select([age < 0.3, age < 0.6], [alpha, alpha * 0.8], alpha * 0.6)
+    red = np.select([age < 0.3, age < 0.6], [1.0, 1.0], 0.8) * scale
+    green = np.select([age < 0.3, age < 0.6], [1.0, 0.6], 0.2) * scale
+    blue = np.where(age < 0.3, 0.8 * scale, 0.0)
+    quads = age < 0.4
 
-        glPointSize(particle['size'])
+    for (x, y, z), r, g, b, particle_size, quad in zip(pos.tolist(), red.tolist(), green.tolist(),
+                                                       blue.tolist(), size.tolist(), quads.tolist()):
+        glColor3f(r, g, b)
+        glPointSize(particle_size)
 
-        if particle['age'] < 0.4:
-            half_size = particle['size'] * 0.5
+        if quad:
+            half_size = particle_size * 0.5
             glBegin(GL_QUADS)
-            glVertex3f(particle['pos'][0] - half_size, particle['pos'][1] - half_size, particle['pos'][2])
-            glVertex3f(particle['pos'][0] + half_size, particle['pos'][1] - half_size, particle['pos'][2])
-            glVertex3f(particle['pos'][0] + half_size, particle['pos'][1] + half_size, particle['pos'][2])
-            glVertex3f(particle['pos'][0] - half_size, particle['pos'][1] + half_size, particle['pos'][2])
+            glVertex3f(x - half_size, y - half_size, z)
+            glVertex3f(x + half_size, y - half_size, z)
+            glVertex3f(x + half_size, y + half_size, z)
+            glVertex3f(x - half_size, y + half_size, z)
             glEnd()
         else:
             glBegin(GL_POINTS)
-            glVertex3f(particle['pos'][0], particle['pos'][1], particle['pos'][2])
+            glVertex3f(x, y, z)
             glEnd()
 
 
-def draw_asteroid(size, type_id, rotation, heat_level=1.0):
+def draw_asteroid(asteroid):
+    size = asteroid.size
+    type_id = asteroid.type
+    rotation = asteroid.rotation.tolist()
     glPushMatrix()
 
     glRotatef(rotation[0], 1, 0, 0)
@@ -888,7 +1075,7 @@ def draw_asteroid(size, type_id, rotation, heat_level=1.0):
     glPopMatrix()
 
 
-def draw_bullet(is_player=True, is_helper=False):
+def draw_bullet(is_player=True, is_helper=False, style=0, color=(1.0, 0.0, 0.0)):
     glPushMatrix()
 
     if is_player:
@@ -900,14 +1087,14 @@ def draw_bullet(is_player=True, is_helper=False):
             glScalef(0.8, 2.5, 0.8)
         glutSolidCube(3)
     else:
-        r, g, b = game_state.enemy_bullet_color
+        r, g, b = color
         glColor3f(r, g, b)
 
-        if game_state.enemy_shooting_style == 0:
+        if style == 0:
             glutSolidCube(4)
-        elif game_state.enemy_shooting_style == 1:
+        elif style == 1:
             glutSolidSphere(3, 10, 10)
-        elif game_state.enemy_shooting_style == 2:
+        elif style == 2:
             glScalef(1.5, 1.5, 1.5)
             glBegin(GL_QUADS)
 
@@ -952,7 +1139,7 @@ def draw_bullet(is_player=True, is_helper=False):
 
             glEnd()
 
-        elif game_state.enemy_shooting_style == 3:
+        elif style == 3:
             glutSolidCube(5)
         else:
             glRotatef(90, 1, 0, 0)
@@ -992,70 +1179,18 @@ def draw_bullet(is_player=True, is_helper=False):
 
 
 def draw_solid_torus(inner_radius, outer_radius, sides, rings):
-    two_pi = 2.0 * math.pi
-
-    for i in range(rings):
-        ring_angle1 = i * two_pi / rings
-        ring_angle2 = (i + 1) * two_pi / rings
-
-        cos_ring1 = math.cos(ring_angle1)
-        sin_ring1 = math.sin(ring_angle1)
-        cos_ring2 = math.cos(ring_angle2)
-        sin_ring2 = math.sin(ring_angle2)
-        glBegin(GL_TRIANGLES)
-
-        for j in range(sides):
-            side_angle1 = j * two_pi / sides
-            side_angle2 = (j + 1) * two_pi / sides
-            cos_side1 = math.cos(side_angle1)
-            sin_side1 = math.sin(side_angle1)
-            cos_side2 = math.cos(side_angle2)
-            sin_side2 = math.sin(side_angle2)
-            x1 = (outer_radius + inner_radius * cos_side1) * cos_ring1
-            y1 = (outer_radius + inner_radius * cos_side1) * sin_ring1
-            z1 = inner_radius * sin_side1
-            nx1 = cos_side1 * cos_ring1
-            ny1 = cos_side1 * sin_ring1
-            nz1 = sin_side1
-            x2 = (outer_radius + inner_radius * cos_side1) * cos_ring2
-            y2 = (outer_radius + inner_radius * cos_side1) * sin_ring2
-            z2 = inner_radius * sin_side1
-            nx2 = cos_side1 * cos_ring2
-            ny2 = cos_side1 * sin_ring2
-            nz2 = sin_side1
-            x3 = (outer_radius + inner_radius * cos_side2) * cos_ring1
-            y3 = (outer_radius + inner_radius * cos_side2) * sin_ring1
-            z3 = inner_radius * sin_side2
-            nx3 = cos_side2 * cos_ring1
-            ny3 = cos_side2 * sin_ring1
-            nz3 = sin_side2
-            x4 = (outer_radius + inner_radius * cos_side2) * cos_ring2
-            y4 = (outer_radius + inner_radius * cos_side2) * sin_ring2
-            z4 = inner_radius * sin_side2
-            nx4 = cos_side2 * cos_ring2
-            ny4 = cos_side2 * sin_ring2
-            nz4 = sin_side2
-
-            glNormal3f(nx1, ny1, nz1)
-            glVertex3f(x1, y1, z1)
-
-            glNormal3f(nx2, ny2, nz2)
-            glVertex3f(x2, y2, z2)
-
-            glNormal3f(nx3, ny3, nz3)
-            glVertex3f(x3, y3, z3)
-            glNormal3f(nx2, ny2, nz2)
-            glVertex3f(x2, y2, z2)
-
-            glNormal3f(nx4, ny4, nz4)
-            glVertex3f(x4, y4, z4)
-
-            glNormal3f(nx3, ny3, nz3)
-            glVertex3f(x3, y3, z3)
+    display_lists.draw(('torus', inner_radius, outer_radius, sides, rings),
+                       build_solid_torus, inner_radius, outer_radius, sides, rings)
 
-        glEnd()
 
-def draw_explosion(size, age):
+def build_solid_torus(inner_radius, outer_radius, sides, rings):
+    vertices, normals = torus_triangles(inner_radius, outer_radius, sides, rings)
+    emit_vertex_array(GL_TRIANGLES, vertices, normals)
+
+
+def draw_explosion(explosion):
+    size = explosion.size
+    age = explosion.age
     alpha_fx.start_effect("glow", brightness=1.5)
 
     if age < 0.3:
@@ -1095,35 +1230,38 @@ def draw_explosion(size, age):
     alpha_fx.end_effect()
 
 def draw_stars_and_planets():
+    # The scenery is shared and read-only; its animation is a function of the sim clock.
+    now = game_state.clock()
+    ticks = now / SIM_DT
 
     glPointSize(2)
-    for star in game_state.stars:
+    for star in game_state.scene.stars:
 
-        brightness = star['brightness'] * (0.7 + 0.3 * math.sin(time.time() * star['blink_rate']))
+        brightness = star.brightness * (0.7 + 0.3 * math.sin(now * star.blink_rate))
         glColor3f(brightness, brightness, brightness)
 
         glBegin(GL_POINTS)
-        glVertex3f(star['pos'][0], star['pos'][1], star['pos'][2])
+        glVertex3f(star.x, star.y, star.z)
         glEnd()
 
-    for planet in game_state.planets:
-        r, g, b = planet['color']
+    for planet in game_state.scene.planets:
+        r, g, b = planet.color
         glColor3f(r, g, b)
 
         glPushMatrix()
-        glTranslatef(planet['pos'][0], planet['pos'][1], planet['pos'][2])
+        glTranslatef(planet.x, planet.y, planet.z)
 
-        glRotatef(planet['rotation'], 0, 0, 1)
+        glRotatef((planet.rotation + planet.rotation_speed * ticks) % 360, 0, 0, 1)
 
-        glutSolidSphere(planet['size'], 20, 20)
+        glutSolidSphere(planet.size, 20, 20)
 
-        if planet['rings']:
-            ring_r, ring_g, ring_b = planet['ring_color']
+        if planet.rings:
+            ring_r, ring_g, ring_b = planet.ring_color
             glColor3f(ring_r, ring_g, ring_b)
             glRotatef(75, 1, 0, 0)
 
             glPushMatrix()
-            glutSolidTorus(planet['size'] / 10, planet['size'] * 1.8, 20, 30)
+            glutSolidTorus(planet.size / 10, planet.size * 1.8, 20, 30)
             glPopMatrix()
 
         glPopMatrix()
@@ -1131,7 +1269,7 @@ def draw_stars_and_planets():
 
 def draw_aurora_effect():
 
-    fade_time = time.time() - game_state.aurora_time
+    fade_time = game_state.clock() - game_state.aurora_time
     if fade_time < 0.3:
         opacity = fade_time / 0.3
     elif fade_time > 1.2:
@@ -1139,178 +1277,111 @@ def draw_aurora_effect():
     else:
         opacity = 1.0
 
-    alpha_fx.start_effect("glow", brightness=1.2)
-
-    color1 = game_state.aurora_colors[0]
-    color2 = game_state.aurora_colors[1]
-    for layer in range(5):
-        wave_time = time.time() * (0.5 + layer * 0.1)
-        layer_height = -200 + layer * 100
-        layer_opacity = opacity * (0.3 + layer * 0.2)
-        grid_size = 50
-        glBegin(GL_QUADS)
-        for i in range(-grid_size, grid_size - 2, 2):
-            for j in range(-grid_size, grid_size - 4, 4):
-                x1 = i * 10
-                y1 = j * 10
-                x2 = (i + 2) * 10
-                y2 = (j + 4) * 10
-
-                wave1_bl = 20 * math.sin(x1 / 100 + wave_time)
-                wave2_bl = 15 * math.cos(y1 / 120 + wave_time * 0.7)
-                z1 = layer_height + wave1_bl + wave2_bl
-
-                wave1_br = 20 * math.sin(x2 / 100 + wave_time)
-                wave2_br = 15 * math.cos(y1 / 120 + wave_time * 0.7)
-                z2 = layer_height + wave1_br + wave2_br
-
-                wave1_tr = 20 * math.sin(x2 / 100 + wave_time)
-                wave2_tr = 15 * math.cos(y2 / 120 + wave_time * 0.7)
-                z3 = layer_height + wave1_tr + wave2_tr
-
-                wave1_tl = 20 * math.sin(x1 / 100 + wave_time)
-                wave2_tl = 15 * math.cos(y2 / 120 + wave_time * 0.7)
-                z4 = layer_height + wave1_tl + wave2_tl
-                avg_x = (x1 + x2) / 2
-                t = (math.sin(avg_x / 200 + wave_time) + 1) / 2
-                r = color1[0] * (1 - t) + color2[0] * t
-                g = color1[1] * (1 - t) + color2[1] * t
-                b = color1[2] * (1 - t) + color2[2] * t
-                alpha_fx.set_color(r, g, b, layer_opacity)
-                glVertex3f(x1, y1, z1)
-                glVertex3f(x2, y1, z2)
-                glVertex3f(x2, y2, z3)
-                glVertex3f(x1, y2, z4)
-        glEnd()
-
-    alpha_fx.end_effect()
+    vertices, colors = aurora_mesh.update(game_state.clock(), opacity,
+                                          game_state.aurora_colors[0], game_state.aurora_colors[1])
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices)
+    glColorPointer(3, GL_FLOAT, 0, colors)
+    glDrawArrays(GL_QUADS, 0, len(vertices))
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
 
 
 def draw_transparent_grid():
     pass
 
-def update_asteroid_trail(asteroid, dt):
-
-    max_particles = 15 if asteroid['size'] > 15 else 8
-
-    if random.random() < 0.3:
-        if 'heat_level' not in asteroid:
-            asteroid['heat_level'] = random.uniform(0.5, 1.0)
-
-        particle = {
-            'pos': asteroid['pos'].copy(),
-            'size': asteroid['size'] * 0.8 * random.uniform(0.5, 1.0),
-            'age': 0.0,
-            'lifetime': random.uniform(0.5, 1.5),
-            'color': [0.9, 0.6, 0.2],
-            'heat_level': asteroid['heat_level']
-        }
-
-        offset_range = asteroid['size'] * 0.2
-        particle['pos'][0] += random.uniform(-offset_range, offset_range)
-        particle['pos'][1] += random.uniform(-offset_range, offset_range)
-        particle['pos'][2] += random.uniform(-offset_range, offset_range)
-
-        asteroid['trail_particles'].append(particle)
-
-    for particle in asteroid['trail_particles'][:]:
-        particle['age'] += dt
-
-        if particle['age'] > particle['lifetime']:
-            asteroid['trail_particles'].remove(particle)
-            continue
-        age_ratio = particle['age'] / particle['lifetime']
-        particle['size'] *= (1.0 - dt * 0.5)
-        fade_factor = 1.0 - age_ratio
-        particle['color'][0] = 0.9 * fade_factor
-        particle['color'][1] = 0.6 * fade_factor
-        particle['color'][2] = 0.2 * fade_factor
-
-    while len(asteroid['trail_particles']) > max_particles:
-        asteroid['trail_particles'].pop(0)
-
-def initialize_asteroids(count=5):
-    asteroids = []
-
+def update_asteroid_trails(dt):
+    asteroids = game_state.asteroids
+    trails = game_state.trails
+    rows = np.flatnonzero(asteroids.alive[:asteroids.count])
+    emitters = asteroids.emitter[rows]
+    size = asteroids.size[rows]
+
+    draws = trails.rng.random((len(rows), 6), dtype=np.float32)
+    emitting = draws[:, 0] < 0.3
+    if emitting.any():
+        rows = rows[emitting]
+        size = size[emitting]
+        draws = draws[emitting]
+        offsets = (draws[:, 1:4] * 2.0 - 1.0) * (size[:, None] * 0.2)
+        trails.emit(emitters[emitting],
+                    asteroids.pos[rows] + offsets,
+                    size * 0.8 * (0.5 + draws[:, 4] * 0.5),
+                    0.5 + draws[:, 5])
+
+    trails.update(dt)
+
+def initialize_asteroids(state, count=5):
     for _ in range(count):
         pos = [
-            random.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50),
-            random.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50),
-            random.uniform(-100, -50)
+            state.rng.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50),
+            state.rng.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50),
+            state.rng.uniform(-100, -50)
         ]
 
         while math.sqrt(pos[0] ** 2 + pos[1] ** 2) < 200:
-            pos[0] = random.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50)
-            pos[1] = random.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50)
+            pos[0] = state.rng.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50)
+            pos[1] = state.rng.uniform(-GRID_LENGTH + 50, GRID_LENGTH - 50)
 
-        size = random.uniform(15, 30)
+        size = state.rng.uniform(15, 30)
 
         velocity = [
-            random.uniform(-1.5, 1.5),
-            random.uniform(-1.5, 1.5),
-            random.uniform(-0.2, 0.2)
+            state.rng.uniform(-1.5, 1.5),
+            state.rng.uniform(-1.5, 1.5),
+            state.rng.uniform(-0.2, 0.2)
         ]
 
         speed = math.sqrt(velocity[0] ** 2 + velocity[1] ** 2 + velocity[2] ** 2)
         if speed < 0.5:
             factor = 0.5 / speed
             velocity = [v * factor for v in velocity]
-        asteroid_type = random.randint(0, 2)
+        asteroid_type = state.rng.randint(0, 2)
 
-        asteroid = {
-            'pos': pos,
-            'size': size,
-            'velocity': velocity,
-            'rotation': [random.uniform(0, 360) for _ in range(3)],
-            'rotation_speed': [random.uniform(-2, 2) for _ in range(3)],
-            'trail_particles': [],
-            'heat_level': random.uniform(0.5, 1.0),
-            'type': asteroid_type
-        }
+        state.add_asteroid(pos, size, asteroid_type, velocity, state.rng.uniform(0.5, 1.0))
 
-        asteroids.append(asteroid)
-
-    return asteroids
+    return state.asteroids
 
 def update_enemy_movement(dt):
-    current_time = time.time()
-    if current_time - game_state.enemy_teleport_time > game_state.enemy_teleport_interval:
-        game_state.enemy_teleport_time = current_time
-        
-        if game_state.enemy_visible:
-            game_state.enemy_visible = False
-        else:
-            game_state.enemy_pos = game_state.generate_random_position(upper_area_only=True)
-            game_state.enemy_direction = [random.uniform(-1, 1), random.uniform(-1, 1), 0]
-            game_state.enemy_visible = True
+    enemies = game_state.enemies
+    n = enemies.count
+    if n == 0:
+        return
 
-            game_state.enemy_target_pos = game_state.generate_random_position(upper_area_only=True)
+    live = enemies.alive[:n]
+    visible = enemies.visible[:n]
+    current_time = game_state.clock()
+    due = live & (current_time - enemies.teleport_time[:n] > enemies.teleport_interval[:n])
+    if due.any():
+        enemies.teleport_time[:n][due] = current_time
+        appearing = np.flatnonzero(due & ~visible)
+        visible[due] = ~visible[due]
+        count = len(appearing)
+        if count:
+            spots = game_state.generate_random_positions(2 * count, upper_area_only=True)
+            enemies.pos[appearing] = spots[:count]
+            enemies.prev_pos[appearing] = spots[:count]
+            enemies.target[appearing] = spots[count:]
+
+    moving = np.flatnonzero(live & visible)
+    if len(moving) == 0:
+        return
 
-    if game_state.enemy_visible:
-        if game_state.enemy_target_pos:
-            dx = game_state.enemy_target_pos[0] - game_state.enemy_pos[0]
-            dy = game_state.enemy_target_pos[1] - game_state.enemy_pos[1]
-            dz = game_state.enemy_target_pos[2] - game_state.enemy_pos[2]
-            
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
+    pos = enemies.pos[moving]
+    offsets = enemies.target[moving] - pos
+    dist = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+    arrived = dist < 10
+    step = enemies.speed[moving] * (dt * 60) / np.maximum(dist, 1e-6)
+    pos[~arrived] += offsets[~arrived] * step[~arrived, None]
 
-            if dist < 10:
-                game_state.enemy_target_pos = game_state.generate_random_position(upper_area_only=True)
-            else:
-                if dist > 0:
-                    dx /= dist
-                    dy /= dist
-                    dz /= dist
-
-                game_state.enemy_pos[0] += dx * game_state.enemy_speed * dt * 60
-                game_state.enemy_pos[1] += dy * game_state.enemy_speed * dt * 60
-                game_state.enemy_pos[2] += dz * game_state.enemy_speed * dt * 60
-                bottom_boundary = -0.2 * GRID_LENGTH
-                if game_state.enemy_pos[1] < bottom_boundary:
-                    game_state.enemy_pos[1] = bottom_boundary
-                    game_state.enemy_target_pos = game_state.generate_random_position(upper_area_only=True)
-        else:
-            game_state.enemy_target_pos = game_state.generate_random_position(upper_area_only=True)
+    bottom_boundary = -0.2 * GRID_LENGTH
+    below = ~arrived & (pos[:, 1] < bottom_boundary)
+    pos[below, 1] = bottom_boundary
+    enemies.pos[moving] = pos
+
+    retarget = moving[arrived | below]
+    if len(retarget):
+        enemies.target[retarget] = game_state.generate_random_positions(len(retarget), upper_area_only=True)
 
 
 def update_helper_aircraft(dt):
@@ -1323,30 +1394,17 @@ def update_helper_aircraft(dt):
         game_state.player_pos[2] + game_state.helper_offset[2]
     ]
 
-    closest_asteroid = None
-    closest_dist = float('inf')
-    
-    for asteroid in game_state.asteroids:
-        dx = asteroid['pos'][0] - helper_pos[0]
-        dy = asteroid['pos'][1] - helper_pos[1]
-        dz = asteroid['pos'][2] - helper_pos[2]
-        
-        dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-        if dist < closest_dist:
-            closest_dist = dist
-            closest_asteroid = asteroid
-
-    if closest_asteroid:
-        game_state.helper_target = closest_asteroid
-
-    current_time = time.time()
+    current_time = game_state.clock()
     if current_time - game_state.helper_last_shot_time > game_state.helper_shooting_interval:
-        if game_state.helper_target:
+        asteroids = game_state.asteroids
+        target_row, _ = asteroid_neighbours.nearest(helper_pos)
+        if target_row != NO_ROW:
             game_state.helper_last_shot_time = current_time
 
-            dx = game_state.helper_target['pos'][0] - helper_pos[0]
-            dy = game_state.helper_target['pos'][1] - helper_pos[1]
-            dz = game_state.helper_target['pos'][2] - helper_pos[2]
+            target_pos = asteroids.pos[target_row]
+            dx = float(target_pos[0]) - helper_pos[0]
+            dy = float(target_pos[1]) - helper_pos[1]
+            dz = float(target_pos[2]) - helper_pos[2]
             
             dist = math.sqrt(dx*dx + dy*dy + dz*dz)
             if dist > 0:
@@ -1354,534 +1412,450 @@ def update_helper_aircraft(dt):
                 dy /= dist
                 dz /= dist
 
-            game_state.player_bullets.append({
-                'pos': helper_pos.copy(),
-                'direction': [dx, dy, dz],
-                'is_helper': True
-            })
+            game_state.player_bullets.add(
+                pos=helper_pos,
+                velocity=[dx * HELPER_BULLET_SPEED, dy * HELPER_BULLET_SPEED, dz * HELPER_BULLET_SPEED],
+                is_helper=True
+            )
 
 
 def update_life_gifts(dt):
     game_state.gift_pulse = (game_state.gift_pulse + dt * 3) % (math.pi * 2)
 
-    for gift in game_state.life_gifts[:]:
-        dx = gift['pos'][0] - game_state.player_pos[0]
-        dy = gift['pos'][1] - game_state.player_pos[1]
-        dz = gift['pos'][2] - game_state.player_pos[2]
-        
-        dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-        if dist < 35:
-            game_state.player_lives += 1
-            game_state.life_gifts.remove(gift)
+    gifts = game_state.life_gifts
+    n = gifts.count
+    if n == 0:
+        return
 
-            game_state.player_flicker = True
-            game_state.flicker_start_time = time.time()
-            game_state.explosions.append({
-                'pos': game_state.player_pos.copy(),
-                'size': 15,
-                'age': 0.0,
-                'duration': 0.3
-            })
+    offsets = gifts.pos[:n] - np.array(game_state.player_pos, dtype=np.float32)
+    collected = gifts.alive[:n] & (np.einsum('ij,ij->i', offsets, offsets) < 35 * 35)
+    for i in np.flatnonzero(collected):
+        game_state.player_lives += 1
+        gifts.kill(i)
 
+        game_state.player_flicker = True
+        game_state.flicker_start_time = game_state.clock()
+        game_state.add_explosion(game_state.player_pos, 15, 0.3)
 
-def update_enemy_bullets():
-    bullets_to_remove = []
-    for idx, bullet in enumerate(game_state.enemy_bullets):
-        prev_position = [bullet['pos'][0], bullet['pos'][1], bullet['pos'][2]]
-
-        bullet['pos'][0] += bullet['vel'][0] * game_state.delta_time
-        bullet['pos'][1] += bullet['vel'][1] * game_state.delta_time
-        bullet['pos'][2] += bullet['vel'][2] * game_state.delta_time
-
-        if (abs(bullet['pos'][0]) > GAME_AREA_SIZE or
-                abs(bullet['pos'][1]) > GAME_AREA_SIZE or
-                bullet['pos'][2] < -200 or bullet['pos'][2] > 200):
-            bullets_to_remove.append(idx)
+
+def update_player_bullets():
+    bullets = game_state.player_bullets
+    asteroids = game_state.asteroids
+    n = bullets.count
+    if n == 0:
+        return
+    bullets.integrate()
+
+    pos = bullets.pos[:n]
+    out_of_bounds = bullets.alive[:n] & ((np.abs(pos[:, 0]) > GRID_LENGTH) | (np.abs(pos[:, 1]) > GRID_LENGTH))
+    if out_of_bounds.any():
+        missed = int(np.count_nonzero(out_of_bounds & ~bullets.is_helper[:n]))
+        if missed:
+            game_state.player_missed_bullets += missed
+            if game_state.player_missed_bullets >= 100:
+                game_state.game_over = True
+        bullets.kill_mask(out_of_bounds)
+
+    m = asteroids.count
+    if m == 0 or not bullets.alive[:n].any():
+        return
+
+    reach = asteroids.size[:m] + 5
+    asteroid_grid.rebuild(asteroids.pos[:m], reach, asteroids.alive[:m])
+    bullet_index, asteroid_index = asteroid_grid.candidate_pairs(bullets.pos[:n], bullets.alive[:n])
+    offsets = bullets.pos[bullet_index] - asteroids.pos[asteroid_index]
+    dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+    hits = dist_sq < reach[asteroid_index] ** 2
+    bullet_index = bullet_index[hits]
+    asteroid_index = asteroid_index[hits]
+    dist_sq = dist_sq[hits]
+    order = np.lexsort((asteroid_index, bullet_index))
+
+    for i, j, d in zip(bullet_index[order].tolist(), asteroid_index[order].tolist(), dist_sq[order].tolist()):
+        if not bullets.alive[i] or not asteroids.alive[j]:
+            continue
+        if d >= (asteroids.size[j] + 5) ** 2:
             continue
 
-        if not game_state.cheat_mode:
-            player_radius = 10.0
-            bullet_radius = 5.0
-
-            direction = [
-                bullet['pos'][0] - prev_position[0],
-                bullet['pos'][1] - prev_position[1],
-                bullet['pos'][2] - prev_position[2]
-            ]
-
-            movement_length = math.sqrt(direction[0] ** 2 + direction[1] ** 2 + direction[2] ** 2)
-
-            if movement_length > 0:
-                direction[0] /= movement_length
-                direction[1] /= movement_length
-                direction[2] /= movement_length
-
-                to_player = [
-                    game_state.player_pos[0] - prev_position[0],
-                    game_state.player_pos[1] - prev_position[1],
-                    game_state.player_pos[2] - prev_position[2]
-                ]
+        game_state.add_explosion(bullets.pos[i], 10, 0.3)
+        bullets.kill(i)
 
-                dot_product = (to_player[0] * direction[0] +
-                               to_player[1] * direction[1] +
-                               to_player[2] * direction[2])
+        asteroid = asteroids.entity(j)
+        asteroid.size -= 5
+        if asteroid.size < 10:
+            asteroid_pos = asteroid.pos.tolist()
+            asteroid_vel = asteroid.velocity.tolist()
+            game_state.add_explosion(asteroid_pos, 15, 0.5)
 
-                dot_product = max(0, min(dot_product, movement_length))
+            if len(asteroids) < 20:
+                for _ in range(2):
+                    new_size = game_state.rng.uniform(7, 12)
 
-                closest_point = [
-                    prev_position[0] + direction[0] * dot_product,
-                    prev_position[1] + direction[1] * dot_product,
-                    prev_position[2] + direction[2] * dot_product
-                ]
+                    new_vel = [
+                        asteroid_vel[0] * game_state.rng.uniform(0.8, 1.2),
+                        asteroid_vel[1] * game_state.rng.uniform(0.8, 1.2),
+                        asteroid_vel[2] * game_state.rng.uniform(0.8, 1.2)
+                    ]
 
-                distance_squared = ((closest_point[0] - game_state.player_pos[0]) ** 2 +
-                                    (closest_point[1] - game_state.player_pos[1]) ** 2 +
-                                    (closest_point[2] - game_state.player_pos[2]) ** 2)
+                    speed_factor = 1.2
+                    new_vel = [v * speed_factor for v in new_vel]
 
-                if distance_squared < (player_radius + bullet_radius) ** 2:
-                    handle_player_hit()
-                    bullets_to_remove.append(idx)
-                    continue
+                    offset = 10
+                    new_pos = [
+                        asteroid_pos[0] + game_state.rng.uniform(-offset, offset),
+                        asteroid_pos[1] + game_state.rng.uniform(-offset, offset),
+                        asteroid_pos[2] + game_state.rng.uniform(-offset, offset)
+                    ]
 
-    for idx in sorted(bullets_to_remove, reverse=True):
-        game_state.enemy_bullets.pop(idx)
+                    if game_state.rng.random() < 0.1:
+                        new_type = asteroid.type
+                    else:
+                        new_type = game_state.rng.randint(0, 2)
 
-def update_game_state():
-    if game_state.game_over:
+                    game_state.add_asteroid(new_pos, new_size, new_type, new_vel, game_state.rng.uniform(0.5, 1.0))
+
+            game_state.remove_asteroid(asteroid.row)
+
+
+def update_enemy_bullets():
+    bullets = game_state.enemy_bullets
+    n = bullets.count
+    if n == 0:
         return
 
-    current_time = time.time()
-    dt = 0.016
-    if game_state.resuming:
-        elapsed = current_time - game_state.countdown_start_time
+    speed = np.where(bullets.style[:n] < 3, np.float32(5.0), np.float32(4.0))
+    initial_pos = bullets.pos[:n].copy()
+    delta = bullets.direction[:n] * speed[:, None]
+    bullets.pos[:n] += delta
+
+    pos = bullets.pos[:n]
+    out_of_bounds = (np.abs(pos[:, 0]) > GRID_LENGTH) | (np.abs(pos[:, 1]) > GRID_LENGTH)
+    bullets.kill_mask(out_of_bounds)
+
+    live = np.flatnonzero(bullets.alive[:n])
+    radius = game_state.shield_radius if game_state.cheat_mode else 60
+    hits, _, contacts = swept_sphere_contacts(initial_pos[live], delta[live], game_state.player_pos, radius)
+
+    for i, contact in zip(live[hits], contacts):
+        if not game_state.cheat_mode:
+            game_state.player_lives -= 1
+            game_state.add_explosion(contact, 20, 0.5)
+
+            if game_state.player_lives <= 0:
+                game_state.game_over = True
+        else:
+            game_state.last_shield_hit = game_state.clock()
+            game_state.add_explosion(contact, 12, 0.3)
+        bullets.kill(i)
 
-        if elapsed >= game_state.resume_message_duration + 3.0:
-            game_state.resuming = False
 
+def fire_enemy_bullets():
+    enemies = game_state.enemies
+    n = enemies.count
+    if n == 0:
         return
 
-    if game_state.paused:
+    firing = enemies.alive[:n] & enemies.visible[:n] & (game_state.np_rng.random(n) < 0.03)
+    shooters = np.flatnonzero(firing)
+    count = len(shooters)
+    if count == 0:
         return
 
-    update_enemy_movement(dt)
+    angle_h = np.radians(game_state.np_rng.uniform(0, 360, count))
+    angle_v = np.radians(game_state.np_rng.uniform(-30, 30, count))
+    directions = np.stack((np.cos(angle_h) * np.cos(angle_v),
+                           np.sin(angle_h) * np.cos(angle_v),
+                           np.sin(angle_v)), axis=1)
 
-    if game_state.helper_active:
-        update_helper_aircraft(dt)
+    bullets = game_state.enemy_bullets
+    for row, direction in zip(shooters.tolist(), directions):
+        bullets.add(pos=enemies.pos[row], direction=direction,
+                    style=enemies.shooting_style[row], color=enemies.bullet_color[row])
 
-    update_life_gifts(dt)
 
-    for bullet in game_state.player_bullets[:]:
-        bullet_speed = 6.0 if bullet.get('is_helper', False) else 8.0
-        bullet['pos'][0] += bullet_speed * bullet['direction'][0]
-        bullet['pos'][1] += bullet_speed * bullet['direction'][1]
-        if 'direction' in bullet and len(bullet['direction']) > 2:
-            bullet['pos'][2] += bullet_speed * bullet['direction'][2]
-
-        if abs(bullet['pos'][0]) > GRID_LENGTH or abs(bullet['pos'][1]) > GRID_LENGTH:
-            if not bullet.get('is_helper', False):
-                game_state.player_missed_bullets += 1
-                if game_state.player_missed_bullets >= 100:
-                    game_state.game_over = True
-
-            game_state.player_bullets.remove(bullet)
-        for asteroid in game_state.asteroids[:]:
-            if bullet in game_state.player_bullets:
-                dx = bullet['pos'][0] - asteroid['pos'][0]
-                dy = bullet['pos'][1] - asteroid['pos'][1]
-                dz = bullet['pos'][2] - asteroid['pos'][2]
-
-                distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-
-                if distance < asteroid['size'] + 5:
-                    game_state.explosions.append({
-                        'pos': [bullet['pos'][0], bullet['pos'][1], bullet['pos'][2]],
-                        'size': 10,
-                        'age': 0.0,
-                        'duration': 0.3
-                    })
-
-                    if bullet in game_state.player_bullets:
-                        game_state.player_bullets.remove(bullet)
-
-                    asteroid['size'] -= 5
-                    if asteroid['size'] < 10:
-                        game_state.explosions.append({
-                            'pos': asteroid['pos'].copy(),
-                            'size': 15,
-                            'age': 0.0,
-                            'duration': 0.5
-                        })
-
-                        if len(game_state.asteroids) < 20:
-                            for _ in range(2):
-                                new_size = random.uniform(7, 12)
-
-                                new_vel = [
-                                    asteroid['velocity'][0] * random.uniform(0.8, 1.2),
-                                    asteroid['velocity'][1] * random.uniform(0.8, 1.2),
-                                    asteroid['velocity'][2] * random.uniform(0.8, 1.2)
-                                ]
-
-                                speed_factor = 1.2
-                                new_vel = [v * speed_factor for v in new_vel]
-
-                                offset = 10
-                                new_pos = [
-                                    asteroid['pos'][0] + random.uniform(-offset, offset),
-                                    asteroid['pos'][1] + random.uniform(-offset, offset),
-                                    asteroid['pos'][2] + random.uniform(-offset, offset)
-                                ]
-
-                                if random.random() < 0.1 and 'type' in asteroid:
-                                    new_type = asteroid['type']
-                                else:
-                                    new_type = random.randint(0, 2)
-
-                                game_state.asteroids.append({
-                                    'pos': new_pos,
-                                    'size': new_size,
-                                    'velocity': new_vel,
-                                    'rotation': [random.uniform(0, 360) for _ in range(3)],
-                                    'rotation_speed': [random.uniform(-2, 2) for _ in range(3)],
-                                    'trail_particles': [],
-                                    'heat_level': random.uniform(0.5, 1.0),
-                                    'type': new_type
-                                })
-
-                        game_state.asteroids.remove(asteroid)
-                    break
-    for bullet in game_state.enemy_bullets[:]:
-        initial_pos = bullet['pos'].copy()
+def defeat_enemy(row, gift_pos, current_time):
+    enemies = game_state.enemies
+    game_state.enemies_killed += 1
 
-        speed = 5.0 if game_state.enemy_shooting_style < 3 else 4.0
-        delta_x = speed * bullet['direction'][0]
-        delta_y = speed * bullet['direction'][1]
-        delta_z = speed * bullet['direction'][2]
+    if game_state.enemies_killed >= 3 and not game_state.helper_active:
+        game_state.helper_active = True
 
-        bullet['pos'][0] += delta_x
-        bullet['pos'][1] += delta_y
-        bullet['pos'][2] += delta_z
+    game_state.life_gifts.add(pos=gift_pos)
 
-        if abs(bullet['pos'][0]) > GRID_LENGTH or abs(bullet['pos'][1]) > GRID_LENGTH:
-            if bullet in game_state.enemy_bullets:
-                game_state.enemy_bullets.remove(bullet)
-            continue
+    game_state.player_bullet_count += 1
+    game_state.player_shooting_speed += 0.1
 
-        collision_detected = False
-        player_radius = 60
-        for t in range(11):
-            t_fraction = t / 10.0
-            check_point = [
-                initial_pos[0] + t_fraction * delta_x,
-                initial_pos[1] + t_fraction * delta_y,
-                initial_pos[2] + t_fraction * delta_z
-            ]
-
-            dx = check_point[0] - game_state.player_pos[0]
-            dy = check_point[1] - game_state.player_pos[1]
-            dz = check_point[2] - game_state.player_pos[2]
-            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-
-            if not game_state.cheat_mode and distance < player_radius:
-                collision_detected = True
-                game_state.player_lives -= 1
-
-                game_state.explosions.append({
-                    'pos': check_point.copy(),
-                    'size': 20,
-                    'age': 0.0,
-                    'duration': 0.5
-                })
-
-                if game_state.player_lives <= 0:
-                    game_state.game_over = True
-
-                if bullet in game_state.enemy_bullets:
-                    game_state.enemy_bullets.remove(bullet)
-                break
-
-            elif game_state.cheat_mode and distance < game_state.shield_radius:
-                collision_detected = True
-
-                game_state.last_shield_hit = time.time()
-
-                game_state.explosions.append({
-                    'pos': check_point.copy(),
-                    'size': 12,
-                    'age': 0.0,
-                    'duration': 0.3
-                })
-
-                if bullet in game_state.enemy_bullets:
-                    game_state.enemy_bullets.remove(bullet)
-                break
-
-        if collision_detected:
-            continue
+    enemies.max_lives[row] = min(5, int(enemies.max_lives[row]) + 1)
+    enemies.lives[row] = enemies.max_lives[row]
+    enemies.evolution[row] = min(4, int(enemies.evolution[row]) + 1)
+    enemies.color[row] = game_state.generate_enemy_color(int(enemies.evolution[row]))
 
-    if game_state.enemy_visible and random.random() < 0.03:
-        angle_h = random.uniform(0, 360)
-        angle_v = random.uniform(-30, 30)
+    enemies.shooting_style[row] = game_state.rng.randint(0, 4)
+    enemies.bullet_color[row] = [
+        game_state.rng.uniform(0.5, 1.0),
+        game_state.rng.uniform(0.2, 0.8),
+        game_state.rng.uniform(0.2, 0.8)
+    ]
 
-        dx = math.cos(math.radians(angle_h)) * math.cos(math.radians(angle_v))
-        dy = math.sin(math.radians(angle_h)) * math.cos(math.radians(angle_v))
-        dz = math.sin(math.radians(angle_v))
+    game_state.aurora_effect = True
+    game_state.aurora_time = current_time
+    game_state.aurora_colors = game_state.generate_random_aurora_colors()
 
-        game_state.enemy_bullets.append({
-            'pos': game_state.enemy_pos.copy(),
-            'direction': [dx, dy, dz]
-        })
 
-    for bullet in game_state.player_bullets[:]:
-        if not game_state.enemy_visible:
+def update_enemy_hits(current_time):
+    bullets = game_state.player_bullets
+    enemies = game_state.enemies
+    targets = np.flatnonzero(enemies.alive[:enemies.count] & enemies.visible[:enemies.count])
+    shots = np.flatnonzero(bullets.alive[:bullets.count])
+    if len(targets) == 0 or len(shots) == 0:
+        return
+
+    offsets = bullets.pos[shots][:, None, :] - enemies.pos[targets][None, :, :]
+    dist_sq = np.einsum('ijk,ijk->ij', offsets, offsets)
+    hit_radius = 35 * enemies.size[targets]
+    shot_index, target_index = np.nonzero(dist_sq < hit_radius * hit_radius)
+
+    respawned = set()
+    for i, e in zip(shots[shot_index].tolist(), targets[target_index].tolist()):
+        if not bullets.alive[i] or e in respawned:
             continue
+        bullets.kill(i)
+        enemies.lives[e] -= 1
+        game_state.add_explosion(bullets.pos[i], 10, 0.5)
+
+        if enemies.lives[e] <= 0:
+            respawned.add(e)
+            enemy_pos = enemies.pos[e].copy()
+            game_state.add_explosion(enemy_pos, 30, 1.0)
+
+            enemies.pos[e] = game_state.generate_random_position(upper_area_only=True)
+            enemies.prev_pos[e] = enemies.pos[e]
+            enemies.visible[e] = True
+            enemies.teleport_time[e] = current_time
+            defeat_enemy(e, enemy_pos, current_time)
+
+
+def update_bullet_interception():
+    player_bullets = game_state.player_bullets
+    enemy_bullets = game_state.enemy_bullets
+    player_index, enemy_index = bullet_sweep.pairs((player_bullets, enemy_bullets), 15.0)
+    if len(player_index) == 0:
+        return
 
-        dx = bullet['pos'][0] - game_state.enemy_pos[0]
-        dy = bullet['pos'][1] - game_state.enemy_pos[1]
-        dz = bullet['pos'][2] - game_state.enemy_pos[2]
-
-        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-        if distance < 35 * game_state.enemy_size:
-            if bullet in game_state.player_bullets:
-                game_state.player_bullets.remove(bullet)
-                game_state.enemy_lives -= 1
-
-                game_state.explosions.append({
-                    'pos': [bullet['pos'][0], bullet['pos'][1], bullet['pos'][2]],
-                    'size': 10,
-                    'age': 0.0,
-                    'duration': 0.5
-                })
-
-                if game_state.enemy_lives <= 0:
-                    game_state.enemies_killed += 1
-
-                    if game_state.enemies_killed >= 3 and not game_state.helper_active:
-                        game_state.helper_active = True
-
-                    game_state.life_gifts.append({
-                        'pos': game_state.enemy_pos.copy(),
-                        'age': 0.0
-                    })
-
-                    game_state.player_bullet_count += 1
-                    game_state.player_shooting_speed += 0.1
-
-                    game_state.explosions.append({
-                        'pos': [game_state.enemy_pos[0], game_state.enemy_pos[1], game_state.enemy_pos[2]],
-                        'size': 30,
-                        'age': 0.0,
-                        'duration': 1.0
-                    })
-
-                    game_state.enemy_pos = game_state.generate_random_position(upper_area_only=True)
-                    game_state.enemy_max_lives = min(5, game_state.enemy_max_lives + 1)
-                    game_state.enemy_lives = game_state.enemy_max_lives
-                    game_state.enemy_visible = True
-                    game_state.enemy_teleport_time = current_time
-
-                    game_state.enemy_evolution = min(4, game_state.enemy_evolution + 1)
-                    game_state.enemy_color = game_state.generate_enemy_color(game_state.enemy_evolution)
-
-                    game_state.enemy_shooting_style = random.randint(0, 4)
-                    game_state.enemy_bullet_color = [
-                        random.uniform(0.5, 1.0),
-                        random.uniform(0.2, 0.8),
-                        random.uniform(0.2, 0.8)
-                    ]
+    order = np.lexsort((enemy_index, player_index))
+    for i, j in zip(player_index[order].tolist(), enemy_index[order].tolist()):
+        if not player_bullets.alive[i] or not enemy_bullets.alive[j]:
+            continue
+        game_state.add_explosion((player_bullets.pos[i] + enemy_bullets.pos[j]) / 2, 15, 0.7)
+        player_bullets.kill(i)
+        enemy_bullets.kill(j)
+
+
+def update_asteroids(dt):
+    asteroids = game_state.asteroids
+    asteroids.integrate()
+    asteroids.spin()
+
+    update_asteroid_trails(dt)
+
+    n = asteroids.count
+    pos = asteroids.pos[:n]
+    size = asteroids.size[:n]
+    boundary = GRID_LENGTH - size
+    x = pos[:, 0]
+    y = pos[:, 1]
+    wrapped = asteroids.alive[:n] & ((np.abs(x) > boundary) | (np.abs(y) > boundary))
+    if not wrapped.any():
+        return
+
+    indices = np.flatnonzero(wrapped)
+    boundary = boundary[indices]
+    edge = boundary - size[indices]
+    x = x[indices]
+    y = y[indices]
+    pos[indices, 0] = np.where(x > boundary, -edge, np.where(x < -boundary, edge, x))
+    pos[indices, 1] = np.where(y > boundary, -edge, np.where(y < -boundary, edge, y))
+
+    asteroids.prev_pos[indices] = asteroids.pos[indices]
+    for i in indices:
+        game_state.clear_trail(i)
+    velocity = asteroids.velocity[indices]
+    speed = np.hypot(velocity[:, 0], velocity[:, 1])
+    angle_change = np.radians([game_state.rng.uniform(-30, 30) for _ in indices])
+    angle = np.arctan2(velocity[:, 1], velocity[:, 0]) + angle_change
+    asteroids.velocity[indices, 0] = speed * np.cos(angle)
+    asteroids.velocity[indices, 1] = speed * np.sin(angle)
+
+
+def update_asteroid_player_collisions():
+    asteroids = game_state.asteroids
+    n = asteroids.count
+    if n == 0:
+        return
+
+    player_pos = np.array(game_state.player_pos, dtype=np.float32)
+    offsets = asteroids.pos[:n] - player_pos
+    distance = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+    size = asteroids.size[:n]
 
-                    game_state.aurora_effect = True
-                    game_state.aurora_time = current_time
-                    game_state.aurora_colors = game_state.generate_random_aurora_colors()
-
-    for p_bullet in game_state.player_bullets[:]:
-        for e_bullet in game_state.enemy_bullets[:]:
-            dx = p_bullet['pos'][0] - e_bullet['pos'][0]
-            dy = p_bullet['pos'][1] - e_bullet['pos'][1]
-            dz = p_bullet['pos'][2] - e_bullet['pos'][2]
-
-            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-            if distance < 15:
-                game_state.explosions.append({
-                    'pos': [(p_bullet['pos'][0] + e_bullet['pos'][0]) / 2,
-                            (p_bullet['pos'][1] + e_bullet['pos'][1]) / 2,
-                            (p_bullet['pos'][2] + e_bullet['pos'][2]) / 2],
-                    'size': 15,
-                    'age': 0.0,
-                    'duration': 0.7
-                })
-
-                if p_bullet in game_state.player_bullets:
-                    game_state.player_bullets.remove(p_bullet)
-                if e_bullet in game_state.enemy_bullets:
-                    game_state.enemy_bullets.remove(e_bullet)
-                break
-
-    for asteroid in game_state.asteroids:
-        asteroid['pos'][0] += asteroid['velocity'][0]
-        asteroid['pos'][1] += asteroid['velocity'][1]
-        asteroid['pos'][2] += asteroid['velocity'][2]
-
-        asteroid['rotation'][0] += asteroid['rotation_speed'][0]
-        asteroid['rotation'][1] += asteroid['rotation_speed'][1]
-        asteroid['rotation'][2] += asteroid['rotation_speed'][2]
-        for i in range(3):
-            asteroid['rotation'][i] %= 360
-        update_asteroid_trail(asteroid, dt)
-        boundary = GRID_LENGTH - asteroid['size']
-        if abs(asteroid['pos'][0]) > boundary or abs(asteroid['pos'][1]) > boundary:
-            if asteroid['pos'][0] > boundary:
-                asteroid['pos'][0] = -boundary + asteroid['size']
-            elif asteroid['pos'][0] < -boundary:
-                asteroid['pos'][0] = boundary - asteroid['size']
-
-            if asteroid['pos'][1] > boundary:
-                asteroid['pos'][1] = -boundary + asteroid['size']
-            elif asteroid['pos'][1] < -boundary:
-                asteroid['pos'][1] = boundary - asteroid['size']
-
-            asteroid['trail_particles'] = []
-            speed = math.sqrt(asteroid['velocity'][0] ** 2 + asteroid['velocity'][1] ** 2)
-            angle_change = random.uniform(-30, 30)
-            angle = math.degrees(math.atan2(asteroid['velocity'][1], asteroid['velocity'][0])) + angle_change
-            asteroid['velocity'][0] = speed * math.cos(math.radians(angle))
-            asteroid['velocity'][1] = speed * math.sin(math.radians(angle))
     if not game_state.cheat_mode:
-        for asteroid in game_state.asteroids:
-            dx = asteroid['pos'][0] - game_state.player_pos[0]
-            dy = asteroid['pos'][1] - game_state.player_pos[1]
-            dz = asteroid['pos'][2] - game_state.player_pos[2]
-
-            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-            if distance < (35 + asteroid['size']):
-                game_state.player_lives -= 1
-
-                game_state.explosions.append({
-                    'pos': [asteroid['pos'][0], asteroid['pos'][1], asteroid['pos'][2]],
-                    'size': asteroid['size'] + 5,
-                    'age': 0.0,
-                    'duration': 0.7
-                })
-                new_pos = game_state.generate_random_position()
-                asteroid['pos'] = new_pos
-                asteroid['trail_particles'] = []
-                if game_state.player_lives <= 0:
-                    game_state.game_over = True
-    else:
-        for asteroid in game_state.asteroids:
-            dx = asteroid['pos'][0] - game_state.player_pos[0]
-            dy = asteroid['pos'][1] - game_state.player_pos[1]
-            dz = asteroid['pos'][2] - game_state.player_pos[2]
-
-            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-            collision_distance = game_state.shield_radius + asteroid['size'] - 5
-
-            if distance < collision_distance:
-                game_state.last_shield_hit = time.time()
-                game_state.explosions.append({
-                    'pos': [
-                        game_state.player_pos[0] + dx * game_state.shield_radius / distance,
-                        game_state.player_pos[1] + dy * game_state.shield_radius / distance,
-                        game_state.player_pos[2] + dz * game_state.shield_radius / distance
-                    ],
-                    'size': asteroid['size'] * 0.5,
-                    'age': 0.0,
-                    'duration': 0.4
-                })
-                if distance > 0:
-                    nx = dx / distance
-                    ny = dy / distance
-                    nz = dz / distance
-                    dot = (asteroid['velocity'][0] * nx +
-                           asteroid['velocity'][1] * ny +
-                           asteroid['velocity'][2] * nz)
-                    bounce_factor = -1.5
-                    randomness = random.uniform(0.8, 1.2)
-
-                    asteroid['velocity'][0] += dot * nx * bounce_factor * randomness
-                    asteroid['velocity'][1] += dot * ny * bounce_factor * randomness
-                    asteroid['velocity'][2] += dot * nz * bounce_factor * randomness
-                    push_distance = collision_distance + 5
-                    asteroid['pos'][0] = game_state.player_pos[0] + nx * push_distance
-                    asteroid['pos'][1] = game_state.player_pos[1] + ny * push_distance
-                    asteroid['pos'][2] = game_state.player_pos[2] + nz * push_distance
-    if game_state.enemy_visible and not game_state.cheat_mode:
-        dx = game_state.player_pos[0] - game_state.enemy_pos[0]
-        dy = game_state.player_pos[1] - game_state.enemy_pos[1]
-        dz = game_state.player_pos[2] - game_state.enemy_pos[2]
-
-        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-        collision_radius = 40 + 30 * game_state.enemy_size
-
-        if distance < collision_radius:
+        hits = np.flatnonzero(asteroids.alive[:n] & (distance < 35 + size))
+        if len(hits) == 0:
+            return
+        respawn = game_state.generate_random_positions(len(hits))
+        for i, pos in zip(hits, respawn):
+            asteroid = asteroids.entity(i)
             game_state.player_lives -= 1
-            game_state.enemy_lives -= 1
-            collision_point = [
-                (game_state.player_pos[0] + game_state.enemy_pos[0]) / 2,
-                (game_state.player_pos[1] + game_state.enemy_pos[1]) / 2,
-                (game_state.player_pos[2] + game_state.enemy_pos[2]) / 2
-            ]
-
-            game_state.explosions.append({
-                'pos': collision_point,
-                'size': 40,
-                'age': 0.0,
-                'duration': 0.8
-            })
-            direction_x = dx / distance if distance > 0 else 0
-            direction_y = dy / distance if distance > 0 else 0
-            game_state.player_pos[0] += direction_x * 20
-            game_state.player_pos[1] += direction_y * 20
-            game_state.enemy_pos = game_state.generate_random_position(upper_area_only=True)
+            game_state.add_explosion(asteroid.pos, asteroid.size + 5, 0.7)
+            asteroid.pos = pos
+            asteroids.prev_pos[i] = pos
+            game_state.clear_trail(i)
             if game_state.player_lives <= 0:
                 game_state.game_over = True
-
-            if game_state.enemy_lives <= 0:
-                game_state.enemies_killed += 1
-
-                if game_state.enemies_killed >= 3 and not game_state.helper_active:
-                    game_state.helper_active = True
-
-                game_state.life_gifts.append({
-                    'pos': collision_point.copy(),
-                    'age': 0.0
-                })
-
-                game_state.player_bullet_count += 1
-                game_state.player_shooting_speed += 0.1
-                game_state.enemy_max_lives = min(5, game_state.enemy_max_lives + 1)
-                game_state.enemy_lives = game_state.enemy_max_lives
-                game_state.enemy_evolution = min(4, game_state.enemy_evolution + 1)
-                game_state.enemy_color = game_state.generate_enemy_color(game_state.enemy_evolution)
-                game_state.enemy_shooting_style = random.randint(0, 4)
-                game_state.enemy_bullet_color = [
-                    random.uniform(0.5, 1.0),
-                    random.uniform(0.2, 0.8),
-                    random.uniform(0.2, 0.8)
+    else:
+        collision_distance = game_state.shield_radius + size - 5
+        hits = asteroids.alive[:n] & (distance < collision_distance)
+        for i in np.flatnonzero(hits):
+            dx, dy, dz = offsets[i].tolist()
+            dist = float(distance[i])
+            game_state.last_shield_hit = game_state.clock()
+            if dist > 0:
+                nx = dx / dist
+                ny = dy / dist
+                nz = dz / dist
+                game_state.add_explosion([
+                    game_state.player_pos[0] + nx * game_state.shield_radius,
+                    game_state.player_pos[1] + ny * game_state.shield_radius,
+                    game_state.player_pos[2] + nz * game_state.shield_radius
+                ], asteroids.size[i] * 0.5, 0.4)
+
+                velocity = asteroids.velocity[i]
+                dot = float(velocity[0] * nx + velocity[1] * ny + velocity[2] * nz)
+                bounce_factor = -1.5
+                randomness = game_state.rng.uniform(0.8, 1.2)
+
+                velocity[0] += dot * nx * bounce_factor * randomness
+                velocity[1] += dot * ny * bounce_factor * randomness
+                velocity[2] += dot * nz * bounce_factor * randomness
+                push_distance = float(collision_distance[i]) + 5
+                asteroids.pos[i] = [
+                    game_state.player_pos[0] + nx * push_distance,
+                    game_state.player_pos[1] + ny * push_distance,
+                    game_state.player_pos[2] + nz * push_distance
                 ]
-                game_state.aurora_effect = True
-                game_state.aurora_time = time.time()
-                game_state.aurora_colors = game_state.generate_random_aurora_colors()
-    for explosion in game_state.explosions[:]:
-        time_factor = 1.0 / explosion['duration'] if explosion['duration'] > 0 else 1.0
-        explosion['age'] += dt * time_factor
-        if explosion['age'] >= 1.0:
-            game_state.explosions.remove(explosion)
+                asteroids.prev_pos[i] = asteroids.pos[i]
+
+
+def update_enemy_player_collision():
+    enemies = game_state.enemies
+    colliding = np.flatnonzero(enemies.alive[:enemies.count] & enemies.visible[:enemies.count])
+    if len(colliding) == 0:
+        return
+
+    player_pos = np.array(game_state.player_pos, dtype=np.float32)
+    offsets = player_pos - enemies.pos[colliding]
+    distance = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+    collision_radius = 40 + 30 * enemies.size[colliding]
+    hits = distance < collision_radius
+
+    for e, (dx, dy, dz), dist in zip(colliding[hits].tolist(), offsets[hits].tolist(), distance[hits].tolist()):
+        game_state.player_lives -= 1
+        enemies.lives[e] -= 1
+        collision_point = ((player_pos + enemies.pos[e]) / 2).tolist()
+
+        game_state.add_explosion(collision_point, 40, 0.8)
+        direction_x = dx / dist if dist > 0 else 0
+        direction_y = dy / dist if dist > 0 else 0
+        game_state.player_pos[0] += direction_x * 20
+        game_state.player_pos[1] += direction_y * 20
+        enemies.pos[e] = game_state.generate_random_position(upper_area_only=True)
+        enemies.prev_pos[e] = enemies.pos[e]
+        if game_state.player_lives <= 0:
+            game_state.game_over = True
+
+        if enemies.lives[e] <= 0:
+            defeat_enemy(e, collision_point, game_state.clock())
+
+
+def update_explosions(dt):
+    explosions = game_state.explosions
+    n = explosions.count
+    if n == 0:
+        return
+    duration = explosions.duration[:n]
+    age = explosions.age[:n]
+    age += np.divide(dt, duration, out=np.full_like(duration, dt), where=duration > 0)
+    explosions.kill_mask(age >= 1.0)
+
+
+def save_previous_positions():
+    game_state.enemies.save_positions()
+    game_state.asteroids.save_positions()
+    game_state.player_bullets.save_positions()
+    game_state.enemy_bullets.save_positions()
+    game_state.explosions.save_positions()
+
+
+def update_game_state(dt=SIM_DT):
+    if input_recorder is not None:
+        input_recorder.end_tick()
+    game_state.clock.advance(dt)
+    save_previous_positions()
+    if game_state.game_over:
+        return
+
+    current_time = game_state.clock()
+    if game_state.resuming:
+        elapsed = current_time - game_state.countdown_start_time
+
+        if elapsed >= game_state.resume_message_duration + 3.0:
+            game_state.resuming = False
+
+        return
+
+    if game_state.paused:
+        return
+
+    asteroids = game_state.asteroids
+    asteroid_neighbours.update(asteroids.pos[:asteroids.count], asteroids.alive[:asteroids.count])
+
+    update_enemy_movement(dt)
+
+    if game_state.helper_active:
+        update_helper_aircraft(dt)
+
+    update_life_gifts(dt)
+
+    update_player_bullets()
+    update_enemy_bullets()
+
+    fire_enemy_bullets()
+
+    update_enemy_hits(current_time)
+    update_bullet_interception()
+    update_asteroids(dt)
+    update_asteroid_player_collisions()
+    if not game_state.cheat_mode:
+        update_enemy_player_collision()
+    update_explosions(dt)
+
     if game_state.aurora_effect:
         if current_time - game_state.aurora_time > 1.5:
             game_state.aurora_effect = False
     boundary = GRID_LENGTH - 40
     game_state.player_pos[0] = max(-boundary, min(boundary, game_state.player_pos[0]))
     game_state.player_pos[1] = max(-boundary, min(boundary, game_state.player_pos[1]))
-    for star in game_state.stars:
-        star['blink_rate'] = star['blink_rate'] * 0.999 + random.uniform(0.45, 2.1) * 0.001
-    for planet in game_state.planets:
-        planet['rotation'] += planet['rotation_speed']
-        if planet['rotation'] > 360:
-            planet['rotation'] -= 360
+
+    game_state.player_bullets.flush()
+    game_state.enemy_bullets.flush()
+    game_state.asteroids.flush()
+    game_state.explosions.flush()
+    game_state.life_gifts.flush()
+    game_state.enemies.flush()
 
 def keyboardListener(key, x, y):
-    global game_state
+    if input_recorder is not None:
+        input_recorder.record_key(key)
     if key == b' ':
         if game_state.game_over:
             return
@@ -1892,7 +1866,7 @@ def keyboardListener(key, x, y):
         if game_state.paused:
             game_state.paused = False
             game_state.resuming = True
-            game_state.countdown_start_time = time.time()
+            game_state.countdown_start_time = game_state.clock()
         else:
             game_state.paused = True
         
@@ -1903,7 +1877,7 @@ def keyboardListener(key, x, y):
 
     if game_state.game_over:
         if key == b'r':
-            game_state = GameState()
+            game_state.reset()
         return
     if game_state.paused or game_state.resuming:
         return
@@ -1936,6 +1910,18 @@ def keyboardListener(key, x, y):
 
 def specialKeyListener(key, x, y):
     global camera_pos
+    if key in (GLUT_KEY_F5, GLUT_KEY_F9) and input_recorder is not None:
+        return
+    if key == GLUT_KEY_F5:
+        save_snapshot(SNAPSHOT_PATH, game_state)
+        return
+    if key == GLUT_KEY_F9:
+        load_snapshot(SNAPSHOT_PATH, game_state)
+        sim_clock.reset()
+        return
+    if key == GLUT_KEY_F3:
+        profiler.toggle(globals())
+        return
     if game_state.paused or game_state.resuming:
         return
 
@@ -1954,49 +1940,46 @@ def specialKeyListener(key, x, y):
 
 
 def mouseListener(button, state, x, y):
+    if input_recorder is not None and state == GLUT_DOWN:
+        input_recorder.record_mouse(button)
     if game_state.game_over or game_state.paused or game_state.resuming:
         return
 
-    current_time = time.time()
+    current_time = game_state.clock()
     if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
         if current_time - game_state.last_shot_time > (1.0 / game_state.player_shooting_speed):
             game_state.last_shot_time = current_time
-            direction = game_state.player_direction.copy()
+            direction = game_state.player_direction
             spread_angle = 10.0
-
-            if game_state.player_bullet_count == 1:
-                bullet_pos = game_state.player_pos.copy()
-                bullet_pos[1] += 15
-
-                game_state.player_bullets.append({
-                    'pos': bullet_pos,
-                    'direction': direction
-                })
-            else:
-                start_angle = -spread_angle * (game_state.player_bullet_count - 1) / 2
-
-                for i in range(game_state.player_bullet_count):
-                    angle = start_angle + i * spread_angle
-                    angle_rad = math.radians(angle)
-                    bullet_dir = direction.copy()
-                    bullet_dir[0] = direction[0] * math.cos(angle_rad) - direction[1] * math.sin(angle_rad)
-                    bullet_dir[1] = direction[0] * math.sin(angle_rad) + direction[1] * math.cos(angle_rad)
-                    length = math.sqrt(bullet_dir[0] ** 2 + bullet_dir[1] ** 2)
+            bullets = game_state.player_bullets
+            start_angle = -spread_angle * (game_state.player_bullet_count - 1) / 2
+
+            for i in range(game_state.player_bullet_count):
+                if game_state.player_bullet_count == 1:
+                    dir_x, dir_y = direction[0], direction[1]
+                else:
+                    angle_rad = math.radians(start_angle + i * spread_angle)
+                    dir_x = direction[0] * math.cos(angle_rad) - direction[1] * math.sin(angle_rad)
+                    dir_y = direction[0] * math.sin(angle_rad) + direction[1] * math.cos(angle_rad)
+                    length = math.sqrt(dir_x ** 2 + dir_y ** 2)
                     if length > 0:
-                        bullet_dir[0] /= length
-                        bullet_dir[1] /= length
-
-                    bullet_pos = game_state.player_pos.copy()
-                    bullet_pos[1] += 15
-                    game_state.player_bullets.append({
-                        'pos': bullet_pos,
-                        'direction': bullet_dir
-                    })
+                        dir_x /= length
+                        dir_y /= length
+
+                row = bullets.add(pos=game_state.player_pos)
+                if row == NO_ROW:
+                    break
+                bullets.pos[row, 1] += 15
+                bullets.velocity[row] = (dir_x * PLAYER_BULLET_SPEED,
+                                         dir_y * PLAYER_BULLET_SPEED,
+                                         direction[2] * PLAYER_BULLET_SPEED)
+                bullets.prev_pos[row] = bullets.pos[row]
     if button == GLUT_RIGHT_BUTTON and state == GLUT_DOWN:
         game_state.first_person_mode = not game_state.first_person_mode
 
 
 def showScreen():
+    profiler.begin_frame()
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     glLoadIdentity()
     glViewport(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -2006,13 +1989,17 @@ def showScreen():
     if game_state.aurora_effect:
         draw_aurora_effect()
     draw_transparent_grid()
+    profiler.lap('background')
 
-    for asteroid in game_state.asteroids:
-        draw_asteroid_trail(asteroid['trail_particles'])
+    alpha = sim_clock.alpha
+    positions = game_state.asteroids.interpolated_positions(alpha).tolist()
+    draw_asteroid_trails()
+    for asteroid in game_state.asteroids.entities():
         glPushMatrix()
-        glTranslatef(asteroid['pos'][0], asteroid['pos'][1], asteroid['pos'][2])
-        draw_asteroid(asteroid['size'], asteroid['type'], asteroid['rotation'], asteroid['heat_level'])
+        glTranslatef(*positions[asteroid.row])
+        draw_asteroid(asteroid)
         glPopMatrix()
+    profiler.lap('asteroids')
 
     damage_state = 0
     if game_state.player_lives <= 6:
@@ -2041,30 +2028,38 @@ def showScreen():
         glRotatef(angle, 0, 0, 1)
         draw_stealth_fighter(0, is_helper=True)
         glPopMatrix()
-    if game_state.enemy_visible:
-        damage_level = 1.0 - (game_state.enemy_lives / game_state.enemy_max_lives)
+    positions = game_state.enemies.interpolated_positions(alpha).tolist()
+    for enemy in game_state.enemies.entities():
+        if not enemy.visible:
+            continue
+        damage_level = 1.0 - (enemy.lives / enemy.max_lives)
         glPushMatrix()
-        glTranslatef(game_state.enemy_pos[0], game_state.enemy_pos[1], game_state.enemy_pos[2])
-        glRotatef(time.time() * 30 % 360, 0, 0, 1)
-        draw_ufo_enemy(damage_level, game_state.enemy_color)
+        glTranslatef(*positions[enemy.row])
+        glRotatef(game_state.clock() * 30 % 360, 0, 0, 1)
+        draw_ufo_enemy(damage_level, enemy.color.tolist(), enemy.size)
         glPopMatrix()
-    for gift in game_state.life_gifts:
+    profiler.lap('fighters')
+    for gift in game_state.life_gifts.entities():
         draw_life_gift(gift)
-    for bullet in game_state.player_bullets:
+    positions = game_state.player_bullets.interpolated_positions(alpha).tolist()
+    for bullet in game_state.player_bullets.entities():
         glPushMatrix()
-        glTranslatef(bullet['pos'][0], bullet['pos'][1], bullet['pos'][2])
-        draw_bullet(True, is_helper=bullet.get('is_helper', False))
+        glTranslatef(*positions[bullet.row])
+        draw_bullet(True, is_helper=bullet.is_helper)
         glPopMatrix()
-    for bullet in game_state.enemy_bullets:
+    positions = game_state.enemy_bullets.interpolated_positions(alpha).tolist()
+    for bullet in game_state.enemy_bullets.entities():
         glPushMatrix()
-        glTranslatef(bullet['pos'][0], bullet['pos'][1], bullet['pos'][2])
-        draw_bullet(False)
+        glTranslatef(*positions[bullet.row])
+        draw_bullet(False, style=bullet.style, color=bullet.color.tolist())
         glPopMatrix()
-    for explosion in game_state.explosions:
+    positions = game_state.explosions.interpolated_positions(alpha).tolist()
+    for explosion in game_state.explosions.entities():
         glPushMatrix()
-        glTranslatef(explosion['pos'][0], explosion['pos'][1], explosion['pos'][2])
-        draw_explosion(explosion['size'], explosion['age'])
+        glTranslatef(*positions[explosion.row])
+        draw_explosion(explosion)
         glPopMatrix()
+    profiler.lap('effects')
     if game_state.paused:
         glMatrixMode(GL_PROJECTION)
         glPushMatrix()
@@ -2107,7 +2102,7 @@ def showScreen():
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
-        elapsed = time.time() - game_state.countdown_start_time
+        elapsed = game_state.clock() - game_state.countdown_start_time
         if elapsed < game_state.resume_message_duration:
             draw_centered_text_2d(game_state.resume_message, 0, GLUT_BITMAP_TIMES_ROMAN_24, 1.0, 1.0, 0.3)
         else:
@@ -2140,6 +2135,8 @@ def showScreen():
         draw_centered_text_2d("GAME OVER", 20, GLUT_BITMAP_TIMES_ROMAN_24, 1.0, 0.2, 0.2)
         draw_centered_text_2d("Press 'R' to restart", -40, GLUT_BITMAP_HELVETICA_18, 1.0, 0.7, 0.7)
     draw_hud_text()
+    if profiler.enabled:
+        draw_profiler_overlay()
 
     glutSwapBuffers()
 
@@ -2165,10 +2162,37 @@ def setupCamera():
 
 
 def idle():
-    update_game_state()
+    start = time.perf_counter()
+    if sim_clock.advance(update_game_state) == 0:
+        time.sleep(min(sim_clock.time_to_next_step(), 0.001))
+    else:
+        profiler.add('update', time.perf_counter() - start)
     glutPostRedisplay()
 
-def main():
+def main(argv=None):
+    global game_state, input_recorder
+    parser = argparse.ArgumentParser(description="Space shooter game.")
+    parser.add_argument('--seed', type=replay_seed, help="seed for the game's random number generator")
+    parser.add_argument('--record', metavar='PATH', help="record keyboard and mouse input to a replay file")
+    parser.add_argument('--enemies', type=int, default=1, help="number of enemy UFOs on the field")
+    parser.add_argument('--trace', metavar='PATH', help="write a trace-event JSON file of frame timings on exit")
+    parser.add_argument('--trace-events', type=int, default=500000, metavar='N',
+                        help="trace buffer size; the oldest events are overwritten when it is full")
+    args, _ = parser.parse_known_args(argv)
+
+    seed = args.seed
+    if args.record:
+        if seed is None:
+            seed = random.getrandbits(63)
+        input_recorder = InputRecorder(args.record, seed, SIM_DT, args.enemies)
+    game_state = GameState(random.Random(seed), enemy_count=args.enemies)
+    tracer = None
+    if args.trace:
+        tracer = Tracer(args.trace_events)
+        traced = ['idle', 'update_game_state', 'showScreen']
+        traced.extend(name for name in sorted(globals()) if name.startswith('draw_'))
+        tracer.install(globals(), traced)
+
     glutInit()
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
     glutInitWindowSize(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -2181,7 +2205,17 @@ def main():
     glutSpecialFunc(specialKeyListener)
     glutMouseFunc(mouseListener)
     glutIdleFunc(idle)
-    glutMainLoop()
+    # Closing the window must return from the main loop rather than exit(), so the
+    # recording and the trace below are finished before the process ends.
+    if bool(glutSetOption):
+        glutSetOption(GLUT_ACTION_ON_WINDOW_CLOSE, GLUT_ACTION_GLUTMAINLOOP_RETURNS)
+    try:
+        glutMainLoop()
+    finally:
+        if input_recorder is not None:
+            input_recorder.close(game_state)
+        if tracer is not None:
+            tracer.write(args.trace)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
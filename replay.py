@@ -0,0 +1,124 @@
+import hashlib
+import struct
+
+import numpy as np
+
+REPLAY_MAGIC = b'SSRP'
+REPLAY_VERSION = 2
+HEADER = struct.Struct('<4sHdqH')
+EVENT = struct.Struct('<IBB')
+DIGEST_SIZE = 16
+SEED_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+EVENT_KEY = 0
+EVENT_MOUSE = 1
+EVENT_END = 2
+
+MOUSE_BUTTONS = {0: 'left', 2: 'right'}
+STORE_NAMES = ('player_bullets', 'enemy_bullets', 'asteroids', 'explosions', 'life_gifts', 'enemies')
+STATE_SCALARS = ('player_pos', 'player_lives', 'player_missed_bullets', 'player_bullet_count',
+                 'player_shooting_speed', 'enemies_killed', 'cheat_mode', 'helper_active', 'paused',
+                 'resuming', 'game_over')
+
+
+def replay_seed(text):
+    seed = int(text)
+    if not SEED_RANGE[0] <= seed <= SEED_RANGE[1]:
+        raise ValueError(f"seed {seed} is outside the signed 64-bit range")
+    return seed
+
+
+def state_digest(state):
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for name in STORE_NAMES:
+        store = getattr(state, name)
+        n = store.count
+        h.update(struct.pack('<I', n))
+        h.update(store.alive[:n].tobytes())
+        for field, (shape, dtype) in store.fields.items():
+            if dtype is not object:
+                h.update(np.ascontiguousarray(getattr(store, field)[:n]).tobytes())
+    trails = state.trails
+    h.update(trails.alive.tobytes())
+    h.update(trails.pos.tobytes())
+    h.update(repr([getattr(state, name) for name in STATE_SCALARS]).encode())
+    h.update(repr(state.clock()).encode())
+    h.update(repr(state.rng.getstate()).encode())
+    return h.digest()
+
+
+class InputRecorder:
+    def __init__(self, path, seed, step, enemies=1):
+        if not SEED_RANGE[0] <= seed <= SEED_RANGE[1]:
+            raise ValueError(f"seed {seed} does not fit in a replay header (signed 64-bit)")
+        self.path = path
+        self.tick = 0
+        self.events = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, step, seed, enemies))
+
+    def _write(self, kind, code):
+        self.file.write(EVENT.pack(self.tick, kind, code))
+        self.file.flush()
+        self.events += 1
+
+    def record_key(self, key):
+        self._write(EVENT_KEY, key[0])
+
+    def record_mouse(self, button):
+        if button in MOUSE_BUTTONS:
+            self._write(EVENT_MOUSE, button)
+
+    def end_tick(self):
+        self.tick += 1
+
+    def close(self, state=None):
+        if self.file.closed:
+            return
+        if state is not None:
+            self.file.write(EVENT.pack(self.tick, EVENT_END, 0))
+            self.file.write(state_digest(state))
+        self.file.close()
+
+
+class Replay:
+    def __init__(self, seed, step, ticks, script, digest=None, enemies=1):
+        self.seed = seed
+        self.step = step
+        self.enemies = enemies
+        self.ticks = ticks
+        self.script = script
+        self.digest = digest
+
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: truncated replay header")
+    magic, version, step, seed, enemies = HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC:
+        raise ValueError(f"{path}: not a replay file")
+    if version != REPLAY_VERSION:
+        raise ValueError(f"{path}: unsupported replay version {version}")
+
+    script = {}
+    ticks = 0
+    digest = None
+    offset = HEADER.size
+    while offset + EVENT.size <= len(data):
+        tick, kind, code = EVENT.unpack_from(data, offset)
+        offset += EVENT.size
+        if kind == EVENT_END:
+            ticks = tick
+            digest = data[offset:offset + DIGEST_SIZE]
+            break
+        if kind == EVENT_KEY:
+            event = ('key', bytes([code]))
+        elif kind == EVENT_MOUSE and code in MOUSE_BUTTONS:
+            event = ('mouse', MOUSE_BUTTONS[code])
+        else:
+            raise ValueError(f"{path}: bad event record at byte {offset - EVENT.size}")
+        script.setdefault(tick, []).append(event)
+        ticks = max(ticks, tick + 1)
+    return Replay(seed, step, ticks, script, digest, enemies)
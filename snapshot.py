@@ -0,0 +1,121 @@
+import json
+import struct
+
+import numpy as np
+
+from particles import PARTICLE_ARRAYS
+from replay import STORE_NAMES
+
+SNAPSHOT_MAGIC = b'SSSN'
+SNAPSHOT_VERSION = 3
+HEADER = struct.Struct('<4sHI')
+RUNTIME_FIELDS = ('rng', 'np_rng', 'clock', 'scene', 'trails', 'spawner') + STORE_NAMES
+
+
+def _store_layout(store):
+    fields = [[name, np.dtype(dtype).str, list(shape)]
+              for name, (shape, dtype) in store.fields.items() if dtype is not object]
+    return {
+        'count': store.count,
+        'next_serial': store.next_serial,
+        'generations': len(store.handle_generation),
+        'fields': fields,
+    }
+
+
+def _store_arrays(store):
+    n = store.count
+    arrays = [store.handle[:n], store.serial[:n], store.handle_generation]
+    arrays.extend(getattr(store, name)[:n] for name, dtype, shape in _store_layout(store)['fields'])
+    return arrays
+
+
+def save_snapshot(path, state):
+    for name in STORE_NAMES:
+        getattr(state, name).flush()
+
+    version, mt_state, gauss = state.rng.getstate()
+    scalars = {name: value for name, value in vars(state).items() if name not in RUNTIME_FIELDS}
+    meta = {
+        'scalars': scalars,
+        'clock': state.clock(),
+        'rng': [version, gauss],
+        'trail_rng': state.trails.rng.bit_generator.state,
+        'spawn_rng': state.spawner.rng.bit_generator.state,
+        'np_rng': state.np_rng.bit_generator.state,
+        'trail_capacity': state.trails.capacity,
+        'trail_free': state.trails.free_emitters,
+        'stores': {name: _store_layout(getattr(state, name)) for name in STORE_NAMES},
+    }
+    meta_bytes = json.dumps(meta).encode()
+
+    arrays = [np.array(mt_state, dtype=np.uint32)]
+    arrays.extend(getattr(state.trails, name) for name in PARTICLE_ARRAYS)
+    for name in STORE_NAMES:
+        arrays.extend(_store_arrays(getattr(state, name)))
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(meta_bytes)))
+        f.write(meta_bytes)
+        for array in arrays:
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+class _Reader:
+    def __init__(self, data, offset):
+        self.data = data
+        self.offset = offset
+
+    def read(self, dtype, shape):
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.offset).reshape(shape)
+        self.offset += count * dtype.itemsize
+        return array
+
+
+def load_snapshot(path, state):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: truncated snapshot header")
+    magic, version, meta_size = HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path}: not a snapshot file")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"{path}: unsupported snapshot version {version}")
+    meta = json.loads(data[HEADER.size:HEADER.size + meta_size])
+
+    for name in STORE_NAMES:
+        expected = _store_layout(getattr(state, name))['fields']
+        if meta['stores'][name]['fields'] != expected:
+            raise ValueError(f"{path}: '{name}' fields do not match this build")
+
+    reader = _Reader(data, HEADER.size + meta_size)
+    mt_state = reader.read(np.uint32, (625,))
+    rng_version, gauss = meta['rng']
+    state.rng.setstate((rng_version, tuple(mt_state.tolist()), gauss))
+    state.clock.time = meta['clock']
+
+    trails = state.trails
+    capacity = meta['trail_capacity']
+    trail_arrays = {}
+    for name in PARTICLE_ARRAYS:
+        column = getattr(trails, name)
+        trail_arrays[name] = reader.read(column.dtype, (capacity,) + column.shape[1:])
+    trails.restore(trail_arrays, meta['trail_free'])
+    trails.rng.bit_generator.state = meta['trail_rng']
+    state.spawner.rng.bit_generator.state = meta['spawn_rng']
+    state.np_rng.bit_generator.state = meta['np_rng']
+
+    for name in STORE_NAMES:
+        layout = meta['stores'][name]
+        n = layout['count']
+        handle = reader.read(np.int64, (n,))
+        serial = reader.read(np.int64, (n,))
+        generations = reader.read(np.int64, (layout['generations'],))
+        columns = {field: reader.read(dtype, (n,) + tuple(shape)) for field, dtype, shape in layout['fields']}
+        getattr(state, name).restore(n, columns, handle, serial, layout['next_serial'], generations)
+
+    for name, value in meta['scalars'].items():
+        setattr(state, name, value)
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+NEIGHBOUR_OFFSETS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+
+class SpatialHash:
+    def __init__(self, extent, cell_size=64.0):
+        self.extent = float(extent)
+        self.min_cell_size = float(cell_size)
+        self.cell_size = float(cell_size)
+        self.dims = 1
+        self.keys = np.empty(0, dtype=np.int64)
+        self.items = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _cells(self, points):
+        cells = np.floor((points[:, :2] + self.extent) / self.cell_size).astype(np.int64)
+        np.clip(cells, 0, self.dims - 1, out=cells)
+        return cells
+
+    def cell_of(self, point):
+        last = self.dims - 1
+        cx = min(max(int(math.floor((float(point[0]) + self.extent) / self.cell_size)), 0), last)
+        cy = min(max(int(math.floor((float(point[1]) + self.extent) / self.cell_size)), 0), last)
+        return cx, cy
+
+    def items_in_cells(self, cells):
+        valid = ((cells >= 0) & (cells < self.dims)).all(axis=1)
+        cells = cells[valid]
+        if len(cells) == 0 or len(self.items) == 0:
+            return np.empty(0, dtype=np.int64)
+        keys = cells[:, 0] * self.dims + cells[:, 1]
+        starts = np.searchsorted(self.keys, keys, side='left')
+        counts = np.searchsorted(self.keys, keys, side='right') - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        range_starts = np.cumsum(counts) - counts
+        slots = np.arange(total) - np.repeat(range_starts, counts) + np.repeat(starts, counts)
+        return self.items[slots]
+
+    def rebuild(self, points, radii, mask=None):
+        indices = np.arange(len(points)) if mask is None else np.flatnonzero(mask)
+        largest = float(radii[indices].max()) if len(indices) else 0.0
+        self.cell_size = max(self.min_cell_size, largest)
+        self.dims = max(1, int(math.ceil(2 * self.extent / self.cell_size)))
+
+        cells = self._cells(points[indices])
+        keys = cells[:, 0] * self.dims + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.items = indices[order]
+
+    def candidate_pairs(self, points, mask=None):
+        queries = np.arange(len(points)) if mask is None else np.flatnonzero(mask)
+        if len(queries) == 0 or len(self.items) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        cells = self._cells(points[queries])
+        neighbours = cells[:, None, :] + NEIGHBOUR_OFFSETS[None, :, :]
+        valid = ((neighbours >= 0) & (neighbours < self.dims)).all(axis=2)
+        keys = neighbours[:, :, 0] * self.dims + neighbours[:, :, 1]
+
+        starts = np.searchsorted(self.keys, keys, side='left')
+        counts = np.searchsorted(self.keys, keys, side='right') - starts
+        counts[~valid] = 0
+        starts = starts.ravel()
+        counts = counts.ravel()
+
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        range_starts = np.cumsum(counts) - counts
+        slots = np.arange(total) - np.repeat(range_starts, counts) + np.repeat(starts, counts)
+        query_index = np.repeat(np.repeat(queries, len(NEIGHBOUR_OFFSETS)), counts)
+        return query_index, self.items[slots]
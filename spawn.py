@@ -0,0 +1,84 @@
+import numpy as np
+
+ZONE_SPLITS = 4
+
+
+class SpawnSampler:
+    def __init__(self, seed=None, box_rounds=4, max_rounds=1000):
+        self.rng = np.random.default_rng(seed)
+        self.box_rounds = box_rounds
+        self.max_rounds = max_rounds
+
+    def sample(self, count, low, high, exclusions=()):
+        low = np.asarray(low, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        points = self.rng.uniform(low, high, (count, 3))
+        if count == 0 or not exclusions:
+            return points
+
+        centers = np.array([center for center, radius in exclusions], dtype=np.float64).reshape(-1, 3)
+        radii = np.array([radius for center, radius in exclusions], dtype=np.float64)
+        # Every proposal below is uniform over a superset of the free region and is kept
+        # only if it lands outside all zones, so the accepted points are exactly uniform.
+        # Plain box redraws come first; if zones cover much of the box, later rounds
+        # draw from the box minus the cells that lie wholly inside a zone.
+        pending = np.flatnonzero(self._excluded(points, centers, radii))
+        cells = None
+        for attempt in range(self.max_rounds):
+            if len(pending) == 0:
+                return points
+            if attempt < self.box_rounds:
+                drawn = self.rng.uniform(low, high, (len(pending), 3))
+                accepted = ~self._excluded(drawn, centers, radii)
+            else:
+                if cells is None:
+                    cells = self._cells(low, high, centers, radii)
+                cells_low, cells_high, free, weights = cells
+                picks = self.rng.choice(len(weights), size=len(pending), p=weights)
+                drawn = self.rng.uniform(cells_low[picks], cells_high[picks])
+                accepted = free[picks]
+                check = ~accepted
+                if check.any():
+                    accepted[check] = ~self._excluded(drawn[check], centers, radii)
+            points[pending[accepted]] = drawn[accepted]
+            pending = pending[~accepted]
+        if len(pending) == 0:
+            return points
+        raise ValueError("exclusion zones leave almost none of the spawn area free")
+
+    @staticmethod
+    def _excluded(points, centers, radii):
+        offsets = points[:, None, :] - centers[None, :, :]
+        return (np.einsum('ijk,ijk->ij', offsets, offsets) <= radii ** 2).any(axis=1)
+
+    @staticmethod
+    def _cells(low, high, centers, radii):
+        cube_low = centers - radii[:, None]
+        cube_high = centers + radii[:, None]
+        edges = []
+        for axis in range(3):
+            cuts = np.concatenate(([low[axis], high[axis]],
+                                   np.linspace(cube_low[:, axis], cube_high[:, axis], ZONE_SPLITS + 1).ravel()))
+            edges.append(np.unique(np.clip(cuts, low[axis], high[axis])))
+
+        grids = [np.meshgrid(*(e[:-1] for e in edges), indexing='ij'),
+                 np.meshgrid(*(e[1:] for e in edges), indexing='ij')]
+        cells_low = np.stack([g.reshape(-1) for g in grids[0]], axis=1)
+        cells_high = np.stack([g.reshape(-1) for g in grids[1]], axis=1)
+        keep = np.all(cells_high > cells_low, axis=1)
+        cells_low, cells_high = cells_low[keep], cells_high[keep]
+
+        # Cells never straddle a cube face, so each is either clear of every zone's
+        # bounding cube or inside one; drop those whose corners all lie in one sphere.
+        middle = (cells_low + cells_high) / 2
+        inside = np.all((middle[:, None, :] > cube_low[None]) & (middle[:, None, :] < cube_high[None]), axis=2)
+        corners = np.stack([np.where(np.array(bits, dtype=bool), cells_high, cells_low)
+                            for bits in np.ndindex(2, 2, 2)], axis=1)
+        offsets = corners[:, :, None, :] - centers[None, None, :, :]
+        covered = (np.einsum('ijkl,ijkl->ijk', offsets, offsets) <= radii ** 2).all(axis=1).any(axis=1)
+        keep = ~covered
+        cells_low, cells_high = cells_low[keep], cells_high[keep]
+        if len(cells_low) == 0:
+            raise ValueError("exclusion zones cover the whole spawn area")
+        volume = np.prod(cells_high - cells_low, axis=1)
+        return cells_low, cells_high, ~inside.any(axis=1)[keep], volume / volume.sum()
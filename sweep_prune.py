@@ -0,0 +1,88 @@
+import numpy as np
+
+from entity_store import NO_ROW
+
+
+class SweepAndPrune:
+    def __init__(self, axis=0, dense_limit=4096):
+        self.axis = axis
+        self.dense_limit = dense_limit
+        self.handles = np.empty(0, dtype=np.int64)
+        self.groups = np.empty(0, dtype=np.int8)
+
+    def _refresh(self, stores):
+        rows = np.full(len(self.handles), NO_ROW, dtype=np.int64)
+        handles = [self.handles]
+        groups = [self.groups]
+        added_rows = []
+        for group, store in enumerate(stores):
+            in_group = self.groups == group
+            group_rows = store.rows_of(self.handles[in_group])
+            rows[in_group] = group_rows
+
+            n = store.count
+            tracked = np.zeros(n, dtype=bool)
+            tracked[group_rows[group_rows != NO_ROW]] = True
+            added = np.flatnonzero(store.alive[:n] & ~tracked)
+            handles.append(store.handle[added])
+            groups.append(np.full(len(added), group, dtype=np.int8))
+            added_rows.append(added)
+
+        rows = np.concatenate([rows] + added_rows)
+        live = rows != NO_ROW
+        self.handles = np.concatenate(handles)[live]
+        self.groups = np.concatenate(groups)[live]
+        return rows[live]
+
+    def _dense_pairs(self, stores, distance):
+        first, second = stores
+        a = np.flatnonzero(first.alive[:first.count])
+        b = np.flatnonzero(second.alive[:second.count])
+        offsets = first.pos[a][:, None, :] - second.pos[b][None, :, :]
+        close_a, close_b = np.nonzero(np.einsum('ijk,ijk->ij', offsets, offsets) < distance * distance)
+        return a[close_a], b[close_b]
+
+    def pairs(self, stores, distance):
+        empty = np.empty(0, dtype=np.int64)
+        first, second = stores
+        if len(first) == 0 or len(second) == 0:
+            return empty, empty
+        if first.count * second.count <= self.dense_limit:
+            return self._dense_pairs(stores, distance)
+
+        rows = self._refresh(stores)
+
+        pos = np.empty((len(rows), 3), dtype=np.float32)
+        for group, store in enumerate(stores):
+            in_group = self.groups == group
+            pos[in_group] = store.pos[rows[in_group]]
+
+        order = np.argsort(pos[:, self.axis], kind='stable')
+        self.handles = self.handles[order]
+        self.groups = self.groups[order]
+        rows = rows[order]
+        pos = pos[order]
+
+        keys = pos[:, self.axis]
+        n = len(keys)
+        ends = np.searchsorted(keys, keys + distance, side='left')
+        counts = ends - np.arange(n) - 1
+        np.maximum(counts, 0, out=counts)
+        total = int(counts.sum())
+        if total == 0:
+            return empty, empty
+
+        first = np.repeat(np.arange(n), counts)
+        second = first + 1 + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        crossing = self.groups[first] != self.groups[second]
+        first = first[crossing]
+        second = second[crossing]
+        offsets = pos[first] - pos[second]
+        close = np.einsum('ij,ij->i', offsets, offsets) < distance * distance
+        first = first[close]
+        second = second[close]
+
+        swap = self.groups[first] != 0
+        a = np.where(swap, second, first)
+        b = np.where(swap, first, second)
+        return rows[a], rows[b]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from collision import swept_sphere_contacts
+
+SAMPLES = 4001
+
+
+@pytest.mark.parametrize('count', [1, 7, 500])
+@pytest.mark.parametrize('seed', range(10))
+def test_swept_sphere_contacts_match_sampled_paths(seed, count):
+    rng = np.random.default_rng(seed)
+    center = rng.uniform(-50, 50, 3).astype(np.float32)
+    radius = float(rng.uniform(5, 40))
+    start = (center + rng.uniform(-120, 120, (count, 3))).astype(np.float32)
+    delta = rng.uniform(-150, 150, (count, 3)).astype(np.float32)
+    delta[:count // 25] = 0
+
+    hits, enter_t, contacts = swept_sphere_contacts(start, delta, center, radius)
+
+    t = np.linspace(0.0, 1.0, SAMPLES)
+    path = start[:, None, :] + t[None, :, None] * delta[:, None, :]
+    distance = np.linalg.norm(path - center, axis=2)
+    slack = np.linalg.norm(delta, axis=1) / (SAMPLES - 1) + 1e-3
+
+    sampled_hits = (distance < radius).any(axis=1)
+    assert not (sampled_hits & ~hits).any()
+    assert (distance.min(axis=1)[hits & ~sampled_hits] < radius + slack[hits & ~sampled_hits]).all()
+
+    rows = np.flatnonzero(hits)
+    assert len(enter_t) == len(contacts) == len(rows)
+    assert ((enter_t >= 0) & (enter_t <= 1)).all()
+    np.testing.assert_allclose(contacts, start[rows] + enter_t[:, None] * delta[rows], atol=1e-3)
+    for row, entered in zip(rows, enter_t):
+        inside = np.flatnonzero(distance[row] < radius)
+        if len(inside):
+            assert abs(t[inside[0]] - entered) <= 1.0 / (SAMPLES - 1) + 1e-4 or entered == 0
+        if entered > 0:
+            assert abs(np.linalg.norm(start[row] + entered * delta[row] - center) - radius) < 1e-2
+
+
+def test_start_inside_sphere_enters_at_zero():
+    start = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    delta = np.array([[30.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    hits, enter_t, contacts = swept_sphere_contacts(start, delta, [0.0, 0.0, 0.0], 5.0)
+    assert hits.dtype == bool and enter_t.dtype == np.float32 and contacts.dtype == np.float32
+    assert hits.tolist() == [True, True]
+    assert enter_t.tolist() == [0.0, 0.0]
+    np.testing.assert_allclose(contacts, start)
+
+
+def test_scalar_and_vector_paths_agree():
+    rng = np.random.default_rng(42)
+    start = rng.uniform(-100, 100, (400, 3)).astype(np.float32)
+    delta = rng.uniform(-80, 80, (400, 3)).astype(np.float32)
+    hits, enter_t, contacts = swept_sphere_contacts(start, delta, [5.0, -3.0, 2.0], 30.0)
+    offset = 0
+    for lo in range(0, 400, 10):
+        part_hits, part_t, part_contacts = swept_sphere_contacts(start[lo:lo + 10], delta[lo:lo + 10],
+                                                                 [5.0, -3.0, 2.0], 30.0)
+        np.testing.assert_array_equal(part_hits, hits[lo:lo + 10])
+        found = len(part_t)
+        np.testing.assert_allclose(part_t, enter_t[offset:offset + found], atol=1e-4)
+        np.testing.assert_allclose(part_contacts, contacts[offset:offset + found], atol=1e-2)
+        offset += found
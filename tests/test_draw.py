@@ -0,0 +1,54 @@
+import itertools
+
+import pytest
+
+import project_17 as game
+from headless import HeadlessEngine
+
+
+@pytest.fixture
+def no_gl(monkeypatch):
+    # Replace every GL/GLU/GLUT entry point with a recorder so the draw code can run
+    # without a window; display lists get fresh ids as glGenLists would hand out.
+    calls = []
+
+    def gl_call(name):
+        def call(*args):
+            calls.append(name)
+            return 0
+        return call
+
+    for name in dir(game):
+        if name.startswith('gl') and callable(getattr(game, name)):
+            monkeypatch.setattr(game, name, gl_call(name))
+    ids = itertools.count(1)
+    monkeypatch.setattr(game, 'glGenLists', lambda n: next(ids))
+    monkeypatch.setattr(game, 'display_lists', game.DisplayListCache(vars(game)))
+    monkeypatch.setattr(game, 'profiler', game.FrameProfiler(list_vertices=game.display_lists.vertices))
+    return calls
+
+
+def test_show_screen_smoke(no_gl):
+    engine = HeadlessEngine(autofire=2, enemies=3, seed=11)
+    state = engine.state
+    state.cheat_mode = True
+    state.helper_active = True
+    for tick in range(240):
+        engine.step()
+        if tick % 40 == 0:
+            state.aurora_effect = True
+            state.aurora_time = state.clock()
+            state.aurora_colors = state.generate_random_aurora_colors()
+            game.showScreen()
+    assert 'glCallList' in no_gl
+    assert 'glutSwapBuffers' in no_gl
+
+
+def test_display_lists_compile_once(no_gl):
+    HeadlessEngine(enemies=2, seed=5)
+    game.showScreen()
+    compiled = no_gl.count('glNewList')
+    assert compiled > 0
+    assert all(count > 0 for count in game.display_lists.vertices.values())
+    game.showScreen()
+    assert no_gl.count('glNewList') == compiled
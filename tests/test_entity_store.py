@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from entity_store import NO_ROW, EntityStore
+
+
+def check_store(store, live, dead):
+    assert len(store) == len(live)
+    for handle, value in live.items():
+        row = store.row_of(handle)
+        assert row != NO_ROW and store.alive[row]
+        assert store.handle_of(row) == handle
+        assert store.size[row] == value
+    assert all(store.row_of(handle) == NO_ROW for handle in dead)
+    handles = list(live) + list(dead)
+    np.testing.assert_array_equal(store.rows_of(handles), [store.row_of(handle) for handle in handles])
+
+
+@pytest.mark.parametrize('overflow', ['grow', 'drop', 'recycle'])
+@pytest.mark.parametrize('seed', range(10))
+def test_handles_survive_random_operations(overflow, seed):
+    rng = np.random.default_rng(seed)
+    store = EntityStore(8, overflow=overflow)
+    live = {}
+    dead = set()
+    next_value = 1
+
+    for step in range(2000):
+        op = rng.random()
+        if op < 0.5:
+            recycled = store.recycled
+            row = store.add(size=next_value)
+            if row == NO_ROW:
+                assert overflow == 'drop' and store.count == store.capacity
+            else:
+                if store.recycled > recycled:
+                    oldest = next(iter(live))
+                    del live[oldest]
+                    dead.add(oldest)
+                handle = store.handle_of(row)
+                live[handle] = next_value
+            next_value += 1
+        elif op < 0.85 and live:
+            handle = list(live)[rng.integers(len(live))]
+            store.kill(store.row_of(handle))
+            del live[handle]
+            dead.add(handle)
+        elif op < 0.98:
+            store.flush()
+            assert store.count == len(live)
+        else:
+            store.clear()
+            dead.update(live)
+            live.clear()
+        assert len(store) == len(live)
+        if step % 50 == 0:
+            check_store(store, live, dead)
+    check_store(store, live, dead)
+
+
+def test_kill_mask_defers_removal_until_flush():
+    store = EntityStore(4)
+    handles = [store.handle_of(store.add(size=i)) for i in range(10)]
+    store.kill_mask(store.size[:store.count] % 2 == 0)
+    assert store.count == 10 and len(store) == 5
+    store.flush()
+    assert store.count == 5
+    assert sorted(store.size[:store.count].tolist()) == [1, 3, 5, 7, 9]
+    assert [store.row_of(h) == NO_ROW for h in handles] == [i % 2 == 0 for i in range(10)]
+
+
+def test_recycle_reuses_pending_rows_before_evicting():
+    store = EntityStore(3, overflow='recycle')
+    rows = [store.add(size=i) for i in range(3)]
+    for row in rows:
+        store.kill(row)
+    row = store.add(size=9)
+    assert row != NO_ROW and store.recycled == 0 and store.dropped == 0
+    store.flush()
+    assert store.count == 1 and store.size[0] == 9
+
+    store = EntityStore(2, overflow='recycle')
+    first = store.handle_of(store.add(size=1))
+    store.kill(store.add(size=2))
+    store.add(size=3)
+    assert store.row_of(first) != NO_ROW and store.recycled == 0
+    store.add(size=4)
+    assert store.row_of(first) == NO_ROW and store.recycled == 1
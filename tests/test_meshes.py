@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+import pytest
+
+from meshes import AuroraMesh, sphere_line_vertices, torus_triangles
+
+
+def loop_sphere_lines(lats, longs):
+    vertices = []
+    for i in range(lats + 1):
+        lat = math.pi * (-0.5 + float(i) / lats)
+        z = math.sin(lat)
+        zr = math.cos(lat)
+        for j in range(longs + 1):
+            lng = 2 * math.pi * float(j) / longs
+            vertices.append((math.cos(lng) * zr, math.sin(lng) * zr, z))
+    lines = []
+    for i in range(lats + 1):
+        for j in range(longs):
+            lines += [vertices[i * (longs + 1) + j], vertices[i * (longs + 1) + j + 1]]
+    for i in range(lats):
+        for j in range(longs + 1):
+            lines += [vertices[i * (longs + 1) + j], vertices[(i + 1) * (longs + 1) + j]]
+    return np.array(lines)
+
+
+@pytest.mark.parametrize('lats, longs', [(1, 1), (3, 7), (10, 10), (15, 15)])
+def test_sphere_lines_match_loop_version(lats, longs):
+    vertices = sphere_line_vertices(lats, longs)
+    assert vertices.dtype == np.float32 and vertices.flags['C_CONTIGUOUS']
+    np.testing.assert_allclose(vertices, loop_sphere_lines(lats, longs), atol=1e-6)
+
+
+def loop_torus(inner_radius, outer_radius, sides, rings):
+    vertices = []
+    normals = []
+    two_pi = 2.0 * math.pi
+    for i in range(rings):
+        ring = (i * two_pi / rings, (i + 1) * two_pi / rings)
+        for j in range(sides):
+            side = (j * two_pi / sides, (j + 1) * two_pi / sides)
+            corners = []
+            for side_angle, ring_angle in ((side[0], ring[0]), (side[0], ring[1]),
+                                           (side[1], ring[0]), (side[1], ring[1])):
+                spoke = outer_radius + inner_radius * math.cos(side_angle)
+                corners.append(((spoke * math.cos(ring_angle), spoke * math.sin(ring_angle),
+                                 inner_radius * math.sin(side_angle)),
+                                (math.cos(side_angle) * math.cos(ring_angle),
+                                 math.cos(side_angle) * math.sin(ring_angle), math.sin(side_angle))))
+            for k in (0, 1, 2, 1, 3, 2):
+                vertices.append(corners[k][0])
+                normals.append(corners[k][1])
+    return np.array(vertices), np.array(normals)
+
+
+@pytest.mark.parametrize('inner, outer, sides, rings', [(1, 3, 3, 4), (2.5, 20, 12, 24), (4.5, 81, 20, 30)])
+def test_torus_triangles_match_loop_version(inner, outer, sides, rings):
+    vertices, normals = torus_triangles(inner, outer, sides, rings)
+    expected_vertices, expected_normals = loop_torus(inner, outer, sides, rings)
+    np.testing.assert_allclose(vertices, expected_vertices, rtol=1e-5, atol=1e-4)
+    np.testing.assert_allclose(normals, expected_normals, atol=1e-6)
+
+
+def loop_aurora(time, opacity, color1, color2, brightness=1.2):
+    vertices = []
+    colors = []
+    for layer in range(5):
+        wave_time = time * (0.5 + layer * 0.1)
+        layer_height = -200 + layer * 100
+        alpha = opacity * (0.3 + layer * 0.2)
+        for i in range(-50, 48, 2):
+            for j in range(-50, 46, 4):
+                x1, y1, x2, y2 = i * 10, j * 10, (i + 2) * 10, (j + 4) * 10
+                t = (math.sin((x1 + x2) / 2 / 200 + wave_time) + 1) / 2
+                color = [(color1[c] * (1 - t) + color2[c] * t) * brightness * alpha + offset * alpha
+                         for c, offset in enumerate((0.1, 0.2, 0.3))]
+                for x, y in ((x1, y1), (x2, y1), (x2, y2), (x1, y2)):
+                    z = layer_height + 20 * math.sin(x / 100 + wave_time) + 15 * math.cos(y / 120 + wave_time * 0.7)
+                    vertices.append((x, y, z))
+                    colors.append(color)
+    return np.array(vertices), np.array(colors)
+
+
+@pytest.mark.parametrize('time, opacity', [(0.0, 1.0), (3.7, 0.4), (1234.5, 0.9)])
+def test_aurora_matches_loop_version(time, opacity):
+    color1, color2 = (0.2, 0.9, 0.4), (0.6, 0.1, 0.8)
+    vertices, colors = AuroraMesh().update(time, opacity, color1, color2)
+    expected_vertices, expected_colors = loop_aurora(time, opacity, color1, color2)
+    np.testing.assert_allclose(vertices, expected_vertices, atol=1e-3)
+    np.testing.assert_allclose(colors, expected_colors, atol=1e-5)
@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+import pytest
+
+from nearest import NearestNeighbours
+
+
+def brute_force(points, mask, point, k, radius):
+    live = np.flatnonzero(mask)
+    distances = np.linalg.norm(points[live] - point, axis=1)
+    keep = distances <= radius
+    return np.sort(distances[keep])[:k]
+
+
+@pytest.mark.parametrize('scan_limit', [0, 1 << 20])
+@pytest.mark.parametrize('seed', range(10))
+def test_k_nearest_matches_brute_force(seed, scan_limit):
+    rng = np.random.default_rng(seed)
+    extent = 800.0
+    points = rng.uniform(-1.1 * extent, 1.1 * extent, (int(rng.integers(1, 3000)), 3)).astype(np.float32)
+    points[:, 2] = rng.uniform(-50, 50, len(points))
+    mask = rng.random(len(points)) < 0.9
+    index = NearestNeighbours(extent, cell_size=32, scan_limit=scan_limit)
+    index.update(points, mask)
+
+    for _ in range(30):
+        point = rng.uniform(-1.2 * extent, 1.2 * extent, 3).astype(np.float32)
+        k = int(rng.integers(1, 8))
+        radius = math.inf if rng.random() < 0.5 else float(rng.uniform(10, 400))
+        indices, distances = index.k_nearest(point, k, radius)
+
+        expected = brute_force(points, mask, point, k, radius)
+        np.testing.assert_allclose(distances, expected, rtol=1e-5, atol=1e-3)
+        assert mask[indices].all()
+        assert len(set(indices.tolist())) == len(indices)
+        np.testing.assert_allclose(np.linalg.norm(points[indices] - point, axis=1), distances, rtol=1e-5, atol=1e-3)
+
+
+def test_nearest_on_empty_index():
+    index = NearestNeighbours(100.0)
+    index.update(np.zeros((4, 3), dtype=np.float32), np.zeros(4, dtype=bool))
+    assert index.nearest([0, 0, 0]) == (-1, math.inf)
+
+
+def test_update_marks_index_stale():
+    points = np.array([[0, 0, 0], [50, 0, 0]], dtype=np.float32)
+    index = NearestNeighbours(100.0, scan_limit=0)
+    index.update(points)
+    assert index.nearest([40, 0, 0])[0] == 1
+    points[1] = [-90, 0, 0]
+    index.update(points)
+    assert index.nearest([40, 0, 0])[0] == 0
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from particles import ParticleSystem
+
+
+@pytest.mark.parametrize('count', [3, 40])
+def test_emit_fills_ring_buffers_in_order(count):
+    rng = np.random.default_rng(count)
+    trails = ParticleSystem(emitters=64, slots=4)
+    emitters = np.array([trails.add_emitter(int(limit)) for limit in rng.integers(1, 5, 64)])
+    expected_pos = np.zeros_like(trails.pos)
+    expected_size = np.zeros_like(trails.size)
+    heads = np.zeros(len(emitters), dtype=int)
+
+    for _ in range(6):
+        chosen = rng.permutation(emitters)[:count]
+        pos = rng.uniform(-10, 10, (count, 3)).astype(np.float32)
+        size = rng.uniform(1, 5, count).astype(np.float32)
+        trails.emit(chosen, pos, size, np.ones(count, dtype=np.float32))
+        for emitter, p, s in zip(chosen, pos, size):
+            expected_pos[emitter, heads[emitter]] = p
+            expected_size[emitter, heads[emitter]] = s
+            heads[emitter] = (heads[emitter] + 1) % trails.limit[emitter]
+
+    np.testing.assert_array_equal(trails.head[emitters], heads[emitters])
+    np.testing.assert_array_equal(trails.pos, expected_pos)
+    np.testing.assert_array_equal(trails.size, expected_size)
+    for emitter in emitters:
+        assert not trails.alive[emitter, trails.limit[emitter]:].any()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from spatial_hash import SpatialHash
+
+
+def brute_force_pairs(queries, points, radii, query_mask, item_mask):
+    offsets = queries[:, None, :2] - points[None, :, :2]
+    close = np.einsum('ijk,ijk->ij', offsets, offsets) < radii[None, :] ** 2
+    close &= query_mask[:, None] & item_mask[None, :]
+    return set(zip(*np.nonzero(close)))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_candidate_pairs_cover_every_overlap(seed):
+    rng = np.random.default_rng(seed)
+    extent = 500.0
+    points = rng.uniform(-1.1 * extent, 1.1 * extent, (rng.integers(0, 200), 3))
+    radii = rng.uniform(1, 120 if seed % 2 else 40, len(points))
+    queries = rng.uniform(-1.1 * extent, 1.1 * extent, (rng.integers(0, 300), 3))
+    item_mask = rng.random(len(points)) < 0.8
+    query_mask = rng.random(len(queries)) < 0.8
+
+    grid = SpatialHash(extent, cell_size=64)
+    grid.rebuild(points, radii, item_mask)
+    query_index, items = grid.candidate_pairs(queries, query_mask)
+
+    candidates = list(zip(query_index.tolist(), items.tolist()))
+    assert len(candidates) == len(set(candidates))
+    assert all(query_mask[q] and item_mask[i] for q, i in candidates)
+    assert brute_force_pairs(queries, points, radii, query_mask, item_mask) <= set(candidates)
+
+
+def test_items_in_cells_matches_cell_of():
+    rng = np.random.default_rng(7)
+    points = rng.uniform(-400, 400, (300, 3))
+    grid = SpatialHash(400.0, cell_size=50)
+    grid.rebuild(points, np.full(len(points), 10.0))
+
+    for cell in {grid.cell_of(point) for point in points[:40]}:
+        expected = {i for i, point in enumerate(points) if grid.cell_of(point) == cell}
+        assert set(grid.items_in_cells(np.array([cell])).tolist()) == expected
+    assert len(grid.items_in_cells(np.array([[-1, 0], [grid.dims, 0]]))) == 0
+
+
+def test_empty_grid_has_no_candidates():
+    grid = SpatialHash(100.0)
+    grid.rebuild(np.empty((0, 3)), np.empty(0))
+    query_index, items = grid.candidate_pairs(np.zeros((3, 3)))
+    assert len(query_index) == 0 and len(items) == 0
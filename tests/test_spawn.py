@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from spawn import SpawnSampler
+
+LOW = (-100.0, -100.0, 0.0)
+HIGH = (100.0, 100.0, 10.0)
+
+
+def outside(points, zones):
+    return all((np.linalg.norm(points - center, axis=1) > radius).all() for center, radius in zones)
+
+
+def rejection_reference(seed, count, zones):
+    rng = np.random.default_rng(seed)
+    accepted = []
+    while sum(len(a) for a in accepted) < count:
+        points = rng.uniform(LOW, HIGH, (count, 3))
+        keep = np.ones(count, dtype=bool)
+        for center, radius in zones:
+            keep &= np.linalg.norm(points - center, axis=1) > radius
+        accepted.append(points[keep])
+    return np.concatenate(accepted)[:count]
+
+
+@pytest.mark.parametrize('box_rounds', [0, 4])
+@pytest.mark.parametrize('zones', [
+    [((0.0, 0.0, 5.0), 60.0)],
+    [((0.0, 0.0, 5.0), 120.0), ((90.0, 90.0, 5.0), 5.0)],
+    [((-100.0, -100.0, 0.0), 80.0), ((50.0, 0.0, 5.0), 40.0), ((60.0, 10.0, 5.0), 40.0)],
+])
+def test_samples_are_uniform_over_the_free_region(zones, box_rounds):
+    count = 20000
+    points = SpawnSampler(seed=1, box_rounds=box_rounds).sample(count, LOW, HIGH, zones)
+    assert points.shape == (count, 3)
+    assert ((points >= LOW) & (points <= HIGH)).all()
+    assert outside(points, zones)
+
+    reference = rejection_reference(2, count, zones)
+    bins = [np.linspace(low, high, 5) for low, high in zip(LOW, HIGH)]
+    observed, _ = np.histogramdd(points, bins)
+    expected, _ = np.histogramdd(reference, bins)
+    used = expected > 0
+    assert (observed[~used] == 0).all()
+    chi2 = (((observed - expected) ** 2)[used] / (observed + expected)[used]).sum()
+    assert chi2 < 2 * used.sum()
+
+
+def test_without_zones_samples_the_box():
+    points = SpawnSampler(seed=3).sample(500, LOW, HIGH)
+    assert ((points >= LOW) & (points <= HIGH)).all()
+    assert len(SpawnSampler(seed=3).sample(0, LOW, HIGH, [((0, 0, 0), 10)])) == 0
+
+
+def test_covered_area_raises():
+    with pytest.raises(ValueError):
+        SpawnSampler(seed=4).sample(3, LOW, HIGH, [((0.0, 0.0, 5.0), 150.0)])
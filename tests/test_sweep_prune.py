@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from entity_store import EntityStore
+from sweep_prune import SweepAndPrune
+
+
+def brute_force_pairs(first, second, distance):
+    offsets = first.pos[:first.count, None, :] - second.pos[None, :second.count, :]
+    close = np.einsum('ijk,ijk->ij', offsets, offsets) < distance * distance
+    close &= first.alive[:first.count, None] & second.alive[None, :second.count]
+    return set(zip(*(rows.tolist() for rows in np.nonzero(close))))
+
+
+def fill(store, rng, count):
+    for _ in range(count):
+        store.add(pos=rng.uniform(-300, 300, 3), velocity=rng.uniform(-20, 20, 3))
+
+
+@pytest.mark.parametrize('dense_limit', [0, 1 << 30])
+@pytest.mark.parametrize('seed', range(8))
+def test_pairs_match_brute_force_across_frames(seed, dense_limit):
+    rng = np.random.default_rng(seed)
+    first = EntityStore(16)
+    second = EntityStore(16)
+    fill(first, rng, int(rng.integers(0, 120)))
+    fill(second, rng, int(rng.integers(0, 120)))
+    sweep = SweepAndPrune(axis=seed % 3, dense_limit=dense_limit)
+
+    for _ in range(15):
+        distance = float(rng.uniform(5, 40))
+        rows_a, rows_b = sweep.pairs((first, second), distance)
+        pairs = list(zip(rows_a.tolist(), rows_b.tolist()))
+        assert len(pairs) == len(set(pairs))
+        assert set(pairs) == brute_force_pairs(first, second, distance)
+
+        for store in (first, second):
+            store.integrate()
+            store.kill_mask(rng.random(store.count) < 0.1)
+            store.flush()
+            fill(store, rng, int(rng.integers(0, 15)))
+
+
+def test_empty_store_has_no_pairs():
+    first = EntityStore()
+    second = EntityStore()
+    second.add(pos=[0, 0, 0])
+    rows_a, rows_b = SweepAndPrune(dense_limit=0).pairs((first, second), 10.0)
+    assert len(rows_a) == 0 and len(rows_b) == 0
@@ -0,0 +1,53 @@
+import time
+
+
+class FixedTimestep:
+    def __init__(self, step=1.0 / 60.0, max_steps=5, clock=time.monotonic):
+        self.step = step
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last_time = None
+        self.alpha = 0.0
+        self.dropped_steps = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.last_time = None
+        self.alpha = 0.0
+
+    def advance(self, update):
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_steps:
+            update(self.step)
+            self.accumulator -= self.step
+            steps += 1
+
+        if self.accumulator >= self.step:
+            backlog = int(self.accumulator / self.step)
+            self.dropped_steps += backlog
+            self.accumulator -= backlog * self.step
+
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def time_to_next_step(self):
+        return max(0.0, self.step - self.accumulator)
+
+
+class SimulationClock:
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def __call__(self):
+        return self.time
+
+    def advance(self, dt):
+        self.time += dt
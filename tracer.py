@@ -0,0 +1,80 @@
+import functools
+import json
+import os
+import time
+
+import numpy as np
+
+
+class Tracer:
+    def __init__(self, capacity=500000, clock=time.perf_counter_ns):
+        self.capacity = capacity
+        self.clock = clock
+        self.origin = clock()
+        self.starts = np.zeros(capacity, dtype=np.int64)
+        self.ends = np.zeros(capacity, dtype=np.int64)
+        self.name_ids = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+        self.names = []
+        self._originals = {}
+
+    @property
+    def dropped(self):
+        return max(0, self.count - self.capacity)
+
+    def install(self, namespace, names):
+        for name in names:
+            if name in self._originals:
+                continue
+            func = namespace[name]
+            self._originals[name] = func
+            self.names.append(name)
+            namespace[name] = self._wrap(len(self.names) - 1, func)
+
+    def uninstall(self, namespace):
+        namespace.update(self._originals)
+        self._originals.clear()
+
+    def _wrap(self, name_id, func):
+        clock = self.clock
+        starts = self.starts
+        ends = self.ends
+        name_ids = self.name_ids
+        capacity = self.capacity
+
+        @functools.wraps(func)
+        def traced(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                i = self.count % capacity
+                starts[i] = start
+                ends[i] = clock()
+                name_ids[i] = name_id
+                self.count += 1
+        return traced
+
+    def events(self):
+        n = min(self.count, self.capacity)
+        starts = self.starts[:n]
+        durations = self.ends[:n] - starts
+        order = np.lexsort((-durations, starts))
+        return starts[order], durations[order], self.name_ids[:n][order]
+
+    def write(self, path):
+        starts, durations, name_ids = self.events()
+        ts = ((starts - self.origin) / 1000.0).tolist()
+        dur = (durations / 1000.0).tolist()
+        pid = os.getpid()
+        trace_events = [
+            {'name': self.names[name_id], 'cat': 'frame', 'ph': 'X', 'ts': t, 'dur': d, 'pid': pid, 'tid': 0}
+            for t, d, name_id in zip(ts, dur, name_ids.tolist())
+        ]
+        with open(path, 'w') as f:
+            json.dump({
+                'traceEvents': trace_events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'recorded': self.count, 'dropped': self.dropped},
+            }, f)
+        return len(trace_events)